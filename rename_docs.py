@@ -3,10 +3,19 @@
 Script to rename references in documentation files from Kimi to Nakimi.
 """
 
+import mmap
 import os
-import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    # Optional: single-pass multi-pattern matching (pip install pyahocorasick)
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Mapping of patterns to replacements
 REPLACEMENTS = [
     # Project name variations
@@ -25,40 +34,88 @@ REPLACEMENTS = [
     # Badge URLs (same)
 ]
 
+# All patterns are literals, so plain bytes.replace does the job without any
+# regex machinery. Longest first so "kimi-secrets-vault" is handled before
+# "kimi-vault"; no replacement output contains another pattern, so the chain
+# is order-safe. Everything is ASCII, so replacement runs directly on the
+# UTF-8 bytes of each file.
+ORDERED_REPLACEMENTS = sorted(
+    ((old.encode(), new.encode()) for old, new in REPLACEMENTS), key=lambda pair: len(pair[0]), reverse=True
+)
+
+def build_automaton():
+    automaton = ahocorasick.Automaton()
+    for old, new in REPLACEMENTS:
+        automaton.add_word(old, (len(old), new))
+    automaton.make_automaton()
+    return automaton
+
+AUTOMATON = build_automaton() if AHOCORASICK_AVAILABLE else None
+
+def apply_replacements(content):
+    if AUTOMATON is not None:
+        try:
+            text = content.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+        else:
+            # iter_long yields leftmost-longest, non-overlapping matches in one pass
+            parts = []
+            pos = 0
+            for end, (length, new) in AUTOMATON.iter_long(text):
+                parts.append(text[pos:end - length + 1])
+                parts.append(new)
+                pos = end + 1
+            parts.append(text[pos:])
+            return ''.join(parts).encode('utf-8')
+
+    for old, new in ORDERED_REPLACEMENTS:
+        content = content.replace(old, new)
+    return content
+
+# Every pattern contains one of these; cheap substring checks let clean files skip replacement
+MARKERS = (b"kimi", b"Kimi", b"KIMI")
+
 # Files to process (markdown files)
+def iter_markdown_files(root_dir):
+    # scandir entries carry d_type, so is_dir() needs no extra stat() per entry
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_markdown_files(entry.path)
+            elif entry.name.endswith('.md'):
+                yield Path(entry.path)
+
 def find_markdown_files(root_dir):
-    md_files = []
-    for dirpath, _, filenames in os.walk(root_dir):
-        for f in filenames:
-            if f.endswith('.md'):
-                md_files.append(Path(dirpath) / f)
-    return md_files
+    return list(iter_markdown_files(root_dir))
 
 def process_file(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    original = content
-    for pattern, replacement in REPLACEMENTS:
-        # Use regex to replace whole words? We'll use simple regex
-        content = re.sub(pattern, replacement, content)
-    
-    if content != original:
-        print(f"Updated {filepath}")
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return True
-    return False
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        # Scan the page cache mapping; only copy the file out when a marker is present
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if not any(mm.find(marker) != -1 for marker in MARKERS):
+                return False
+            original = mm[:]
+
+    content = apply_replacements(original)
+    if content == original:
+        return False
+
+    print(f"Updated {filepath}")
+    with open(filepath, 'wb') as f:
+        f.write(content)
+    return True
 
 def main():
     root_dir = Path(__file__).parent
     md_files = find_markdown_files(root_dir)
     
-    updated = 0
-    for md in md_files:
-        if process_file(md):
-            updated += 1
-    
+    # Files are independent and the work is mostly I/O, so overlap them
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        updated = sum(executor.map(process_file, md_files))
+
     print(f"Updated {updated} of {len(md_files)} markdown files.")
 
 if __name__ == "__main__":
@@ -8,9 +8,13 @@ __version__ = "2.0.0"
 __author__ = "Andre Pitanga"
 __license__ = "MIT"
 
-# Core
-from .core import Vault, VaultConfig, get_config
-from .core.plugin import Plugin, PluginManager, PluginError
+import importlib
+from typing import TYPE_CHECKING
+
+# Core (resolved lazily, see nakimi.core)
+if TYPE_CHECKING:
+    from .core import Vault, VaultConfig, get_config
+    from .core.plugin import Plugin, PluginManager, PluginError
 
 # Plugins are imported from their subpackages
 # from .plugins.gmail import GmailPlugin
@@ -23,3 +27,11 @@ __all__ = [
     "PluginManager",
     "PluginError",
 ]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(".core", __name__), name)
+    globals()[name] = value
+    return value
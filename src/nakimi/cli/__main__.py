@@ -1,12 +1,15 @@
 """Entry point for python -m nakimi.cli"""
 
 import sys
-import io
 
 # Force UTF-8 encoding for stdout/stderr
-# This ensures emoji and Unicode work in pipes, redirects, and Kimi CLI
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
+# This ensures emoji and Unicode work in pipes, redirects, and Kimi CLI.
+# reconfigure() keeps the existing streams (and their line buffering), and
+# is skipped entirely when they are already UTF-8.
+for stream in (sys.stdout, sys.stderr):
+    encoding = (stream.encoding or "").lower().replace("-", "")
+    if encoding != "utf8" and hasattr(stream, "reconfigure"):
+        stream.reconfigure(encoding="utf-8")
 
 from .main import main  # noqa: E402
 
@@ -4,29 +4,21 @@ Main CLI entry point for Nakimi
 Provides plugin-based command execution and vault management.
 """
 
-import argparse
-import json
+import functools
 import os
-import subprocess
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional, Tuple
 
-from nakimi.core import Vault, get_config, secure_delete
+from nakimi.core.config import get_config
 from nakimi.core.plugin import PluginManager, PluginError
 
-# Optional YubiKey support
+# Optional faster JSON parser (pip install nakimi[speedups])
 try:
-    from nakimi.core.yubikey import YubiKeyManager, YubiKeyError, is_wsl2
-
-    YUBIKEY_AVAILABLE = True
+    from orjson import loads as _json_loads
 except ImportError:
-    YUBIKEY_AVAILABLE = False
-    YubiKeyManager = None
-    YubiKeyError = Exception
-
-    def is_wsl2():
-        return False
-
+    from json import loads as _json_loads
 
 # Version - sync with pyproject.toml
 __version__ = "2.0.0"
@@ -43,6 +35,20 @@ def get_secrets_path() -> Path:
     return config.secrets_file
 
 
+def _read_secrets(secrets_path: Path) -> dict:
+    """Decrypt (if needed) and parse a secrets file"""
+    # Check if file is encrypted (.age extension)
+    if os.fspath(secrets_path).endswith(".age"):
+        # Decrypt straight into memory; the plaintext never touches disk
+        from nakimi.core import Vault
+
+        return _json_loads(Vault().decrypt_to_bytes(secrets_path))
+    else:
+        # Plaintext JSON
+        with open(secrets_path, "rb") as f:
+            return _json_loads(f.read())
+
+
 def load_secrets() -> dict:
     """Load and parse secrets JSON"""
     secrets_path = get_secrets_path()
@@ -52,24 +58,22 @@ def load_secrets() -> dict:
             f"No secrets file found at {secrets_path}\n" "Run 'nakimi init' to set up your vault."
         )
 
-    # Check if file is encrypted (.age extension)
-    if str(secrets_path).endswith(".age"):
-        # Need to decrypt first
-        vault = Vault()
-        temp_path = vault.decrypt(secrets_path)
-        try:
-            with open(temp_path, "r") as f:
-                return json.load(f)
-        finally:
-            secure_delete(temp_path)
-    else:
-        # Plaintext JSON
-        with open(secrets_path, "r") as f:
-            return json.load(f)
+    return _read_secrets(secrets_path)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_plugin_command(arg: str) -> Optional[Tuple[str, str]]:
+    """Split a 'plugin.command' argument into its parts, or return None."""
+    plugin, sep, command = arg.partition(".")
+    if sep and not plugin.startswith("-"):
+        return plugin, command
+    return None
 
 
 def cmd_init(args):
     """Initialize vault and generate keys"""
+    from nakimi.core import Vault
+
     config = get_config()
     config.ensure_directories()
 
@@ -91,6 +95,8 @@ def cmd_init(args):
 
 def cmd_encrypt(args):
     """Encrypt a file"""
+    from nakimi.core import Vault, secure_delete
+
     vault = Vault()
 
     input_file = Path(args.file)
@@ -111,6 +117,8 @@ def cmd_encrypt(args):
 
 def cmd_decrypt(args):
     """Decrypt a file"""
+    from nakimi.core import Vault
+
     vault = Vault()
 
     input_file = Path(args.file)
@@ -128,8 +136,37 @@ def cmd_decrypt(args):
         print("⚠️  Warning: Use --keep to preserve decrypted file, or it will be temporary.")
 
 
-def cmd_plugins(args):
-    """List available plugins"""
+def _summarize_plugins(manager: PluginManager, secrets_path: str) -> dict:
+    """Non-secret summary of loaded plugins, as shared with `nakimi session` children"""
+    return {
+        "secrets": secrets_path,
+        "plugins": {name: manager.get_plugin(name).description for name in manager.list_plugins()},
+        "commands": manager.list_commands(),
+    }
+
+
+def _load_plugin_index() -> Optional[dict]:
+    """
+    Return the plugin summary exported by `nakimi session` via NAKIMI_PLUGIN_CACHE.
+
+    Returns None when there is none, or when it was built for a different
+    secrets file than the one in use now.
+    """
+    index_path = os.environ.get("NAKIMI_PLUGIN_CACHE")
+    if not index_path:
+        return None
+    try:
+        with open(index_path, "rb") as f:
+            index = _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get("secrets") != str(get_secrets_path()):
+        return None
+    return index
+
+
+def _discover_all_plugins() -> PluginManager:
+    """Load secrets (if any) and discover every configured plugin"""
     try:
         secrets = load_secrets()
     except PluginError as e:
@@ -140,28 +177,56 @@ def cmd_plugins(args):
 
     # Auto-discover plugins
     manager.discover_plugins()
+    return manager
+
+
+def cmd_plugins(args):
+    """List available plugins"""
+    # Inside a session the plugins were already discovered by the parent
+    summary = _load_plugin_index()
+    if summary is None:
+        manager = _discover_all_plugins()
 
     if args.command == "list":
-        plugins = manager.list_plugins()
+        if summary is not None:
+            plugins = summary["plugins"]
+        else:
+            names = manager.list_plugins()
+            plugins = {name: manager.get_plugin(name).description for name in names}
         if plugins:
             print("Loaded plugins:")
-            for name in plugins:
-                plugin = manager.get_plugin(name)
-                print(f"  • {name:15} - {plugin.description}")
+            for name, description in plugins.items():
+                print(f"  • {name:15} - {description}")
         else:
             print("No plugins loaded.")
             print("Add credentials to your secrets.json to enable plugins.")
 
     elif args.command == "commands":
-        commands = manager.list_commands()
+        commands = summary["commands"] if summary is not None else manager.list_commands()
         if commands:
             print("Available commands:")
-            for cmd in sorted(commands):
+            for cmd in commands:
                 print(f"  {cmd}")
         else:
             print("No commands available.")
 
 
+# Last PluginManager built by cmd_run, with the secrets dict it was built from
+_manager_cache: Optional[Tuple[dict, PluginManager]] = None
+
+
+def _get_plugin_manager(secrets: dict, plugin: str) -> PluginManager:
+    """Return a PluginManager with `plugin` loaded, reused while the secrets are unchanged"""
+    global _manager_cache
+    if _manager_cache is None or _manager_cache[0] is not secrets:
+        _manager_cache = (secrets, PluginManager(secrets))
+    manager = _manager_cache[1]
+    # Import only the plugin being run instead of discovering all of them
+    if manager.get_plugin(plugin) is None:
+        manager.load_plugin(plugin)
+    return manager
+
+
 def cmd_run(args):
     """Run a plugin command"""
     try:
@@ -170,8 +235,7 @@ def cmd_run(args):
         print(f"❌ {e}")
         sys.exit(1)
 
-    manager = PluginManager(secrets)
-    manager.discover_plugins()
+    manager = _get_plugin_manager(secrets, args.plugin)
 
     full_command = f"{args.plugin}.{args.command}"
 
@@ -197,6 +261,8 @@ def cmd_serve(args):
 
 def cmd_upgrade(args):
     """Upgrade nakimi to latest version from GitHub"""
+    import subprocess
+
     repo_url = "https://github.com/apitanga/nakimi.git"
 
     print("🔄 Upgrading nakimi...")
@@ -224,9 +290,17 @@ def cmd_upgrade(args):
             print()
             print("✅ Upgrade complete!")
             print()
-            # Show new version
-            print("New version:")
-            subprocess.run([sys.executable, "-m", "nakimi.cli.main", "--version"])
+            # Show new version, read from the freshly installed dist-info
+            # (this process still has the old modules loaded)
+            import importlib
+            import importlib.metadata
+
+            importlib.invalidate_caches()
+            try:
+                new_version = importlib.metadata.version("nakimi")
+            except importlib.metadata.PackageNotFoundError:
+                new_version = "unknown"
+            print(f"New version: nakimi {new_version}")
         else:
             print()
             print(f"❌ Upgrade failed with exit code {result.returncode}")
@@ -247,6 +321,9 @@ def cmd_session(args):  # noqa: C901
     """Start a secure session with decrypted secrets"""
     import subprocess
 
+    from nakimi.core import Vault, secure_delete
+    from nakimi.core.vault import create_memfd, write_secure_temp_file
+
     config = get_config()
     vault = Vault()
 
@@ -256,10 +333,20 @@ def cmd_session(args):  # noqa: C901
         print("Run 'nakimi init' to set up your vault.")
         sys.exit(1)
 
-    # Decrypt secrets to temp file
+    # Decrypt secrets in memory; child processes read them through a sealed
+    # memfd held open by this process, or a temp file where memfd is missing
     print("🔓 Decrypting vault...")
     try:
-        temp_secrets = vault.decrypt(config.secrets_file)
+        plaintext = vault.decrypt_to_bytes(config.secrets_file)
+        secrets_fd = create_memfd(plaintext, "nakimi-secrets", seal=True)
+        if secrets_fd is not None:
+            temp_secrets = Path(f"/proc/{os.getpid()}/fd/{secrets_fd}")
+        else:
+            temp_secrets = write_secure_temp_file(
+                plaintext,
+                prefix="nakimi-secrets-",
+                suffix=".json",
+            )
     except Exception as e:
         print(f"❌ Failed to decrypt: {e}")
         sys.exit(1)
@@ -267,20 +354,27 @@ def cmd_session(args):  # noqa: C901
     print("✅ Vault decrypted")
     print()
 
-    # Show available plugins
+    # Show available plugins, and share the result with `nakimi plugins` in the session
+    plugin_index = None
     try:
-        with open(temp_secrets, "r") as f:
-            secrets = json.load(f)
+        secrets = _json_loads(plaintext)
         manager = PluginManager(secrets)
         manager.discover_plugins()
+        summary = _summarize_plugins(manager, str(temp_secrets))
 
-        if manager.list_plugins():
+        if summary["plugins"]:
             print("Available plugins:")
-            for name in manager.list_plugins():
-                plugin = manager.get_plugin(name)
-                print(f"  ✅ {name} - {plugin.description}")
+            for name, description in summary["plugins"].items():
+                print(f"  ✅ {name} - {description}")
         else:
             print("⚠️  No plugins configured")
+
+        import json
+
+        plugin_index = write_secure_temp_file(
+            json.dumps(summary).encode(), prefix="nakimi-plugins-", suffix=".json"
+        )
+        os.environ["NAKIMI_PLUGIN_CACHE"] = str(plugin_index)
     except Exception:
         pass
 
@@ -291,7 +385,14 @@ def cmd_session(args):  # noqa: C901
 
     # Set up cleanup
     def cleanup():
-        if temp_secrets.exists():
+        nonlocal secrets_fd, temp_secrets
+        if plugin_index is not None and plugin_index.exists():
+            secure_delete(plugin_index)
+        if secrets_fd is not None:
+            os.close(secrets_fd)
+            secrets_fd = temp_secrets = None
+            print("\n🔒 Vault closed")
+        elif temp_secrets is not None and temp_secrets.exists():
             secure_delete(temp_secrets)
             print("\n🔒 Vault closed")
 
@@ -320,16 +421,22 @@ def cmd_session(args):  # noqa: C901
 
 def cmd_yubikey(args):  # noqa: C901
     """Handle YubiKey commands"""
-    if not YUBIKEY_AVAILABLE:
+    # Optional YubiKey support, only needed by this command
+    try:
+        from nakimi.core.yubikey import YubiKeyManager, YubiKeyError, is_wsl2
+    except ImportError:
         print("❌ YubiKey support not available")
         print("   Install with: pip install yubikey-manager")
         sys.exit(1)
 
+    from nakimi.core import Vault
+
     config = get_config()
 
     if not args.yubikey_command:
         print("❌ No yubikey command specified")
-        print("   Available commands: setup, status, encrypt-key, decrypt-key, verify-pin, change-pin")
+        commands = "setup, status, encrypt-key, decrypt-key, verify-pin, change-pin"
+        print(f"   Available commands: {commands}")
         sys.exit(1)
 
     try:
@@ -356,31 +463,37 @@ def cmd_yubikey(args):  # noqa: C901
                 print(f"⚠️  Could not read slot info: {e}")
                 print("   The slot may not be initialized")
 
-            # Update configuration
-            import os
-
-            os.environ["NAKIMI_YUBIKEY_ENABLED"] = "true"
-            os.environ["NAKIMI_YUBIKEY_SLOT"] = args.slot
-            os.environ["NAKIMI_YUBIKEY_REQUIRE_TOUCH"] = "false" if args.no_touch else "true"
-            os.environ["NAKIMI_YUBIKEY_PIN_PROMPT"] = "false" if args.no_pin_prompt else "true"
-
-            print("✅ Configuration updated")
+            # Update configuration for this process and persist it for later runs
+            settings = {
+                "yubikey_enabled": "true",
+                "yubikey_slot": args.slot,
+                "yubikey_require_touch": "false" if args.no_touch else "true",
+                "yubikey_pin_prompt": "false" if args.no_pin_prompt else "true",
+            }
+            os.environ.update({f"NAKIMI_{key.upper()}": value for key, value in settings.items()})
+            config.save_settings(settings)
+
+            print(f"✅ Configuration saved to {config.config_file}")
             print("   YubiKey will be used for age key encryption")
             print("   Note: age-plugin-yubikey must be installed for encryption/decryption")
             print()
-            print("⚠️  IMPORTANT: Run 'nakimi yubikey encrypt-key' " "to encrypt your existing age key")
+            print(
+                "⚠️  IMPORTANT: Run 'nakimi yubikey encrypt-key' to encrypt your existing age key",
+            )
 
         elif args.yubikey_command == "status":
             print("🔍 Checking YubiKey status...")
 
+            status = yk.status_bundle()
+
             # Check ykman
-            if not yk._check_ykman_installed():
+            if not status["ykman_installed"]:
                 print("❌ ykman CLI not found")
                 print("   Install with: pip install yubikey-manager")
                 sys.exit(1)
 
             # Check YubiKey
-            if not yk._check_yubikey_present():
+            if not status["yubikey_present"]:
                 print("❌ No YubiKey detected")
                 print("   Make sure YubiKey is inserted")
                 sys.exit(1)
@@ -388,7 +501,7 @@ def cmd_yubikey(args):  # noqa: C901
             print("✅ YubiKey detected")
 
             # Check age-plugin-yubikey
-            if not yk._check_age_plugin_installed():
+            if not status["age_plugin_installed"]:
                 print("⚠️  age-plugin-yubikey not found")
                 print("   Install from: https://github.com/str4d/age-plugin-yubikey")
                 if is_wsl2():
@@ -403,14 +516,13 @@ def cmd_yubikey(args):  # noqa: C901
             print(f"   Require touch: {config.yubikey_require_touch}")
             print(f"   PIN prompt: {config.yubikey_pin_prompt}")
 
-            # Try to get slot info
-            try:
-                slot_info = yk.get_slot_info()
+            # Slot info was read alongside the presence check
+            if status["slot_info"] is not None:
                 print(f"\n🔑 Slot {config.yubikey_slot} info:")
-                for key, value in slot_info.items():
+                for key, value in status["slot_info"].items():
                     print(f"   {key}: {value}")
-            except YubiKeyError as e:
-                print(f"\n⚠️  Could not read slot info: {e}")
+            else:
+                print(f"\n⚠️  Could not read slot info: {status['slot_error']}")
 
         elif args.yubikey_command == "encrypt-key":
             print("🔐 Encrypting age key with YubiKey...")
@@ -423,27 +535,28 @@ def cmd_yubikey(args):  # noqa: C901
                 print("   Run 'nakimi init' first to generate a key")
                 sys.exit(1)
 
-            # Read current key
-            with open(vault.key_file, "r") as f:
-                age_key = f.read()
+            # Read current key once; the same bytes are encrypted and backed up
+            key_bytes = vault.key_file.read_bytes()
 
             # Encrypt with YubiKey
             try:
-                encrypted_key = yk.encrypt_age_key(age_key)
+                encrypted_key = yk.encrypt_age_key(key_bytes.decode())
             except Exception as e:
                 print(f"❌ Encryption failed: {e}")
                 sys.exit(1)
 
-            # Backup original key
+            # Backup original key from memory (created 0600, then original timestamps)
             backup_path = vault.key_file.with_suffix(".txt.backup")
             import shutil
 
-            shutil.copy2(vault.key_file, backup_path)
+            fd = os.open(backup_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "wb") as f:
+                f.write(key_bytes)
+            shutil.copystat(vault.key_file, backup_path)
             print(f"✅ Original key backed up to: {backup_path}")
 
             # Write encrypted key
-            with open(vault.key_file, "wb") as f:
-                f.write(encrypted_key)
+            vault.key_file.write_bytes(encrypted_key)
 
             print("✅ Age key encrypted with YubiKey")
             print(f"   Encrypted key saved to: {vault.key_file}")
@@ -459,9 +572,8 @@ def cmd_yubikey(args):  # noqa: C901
                 print(f"❌ Key file not found: {vault.key_file}")
                 sys.exit(1)
 
-            # Read encrypted key
-            with open(vault.key_file, "rb") as f:
-                encrypted_key = f.read()
+            # Read encrypted key (single read of the whole small file)
+            encrypted_key = vault.key_file.read_bytes()
 
             # Try to decrypt
             try:
@@ -512,53 +624,59 @@ def cmd_yubikey(args):  # noqa: C901
         sys.exit(1)
 
 
+# Subcommand name -> handler, built once at import
+_COMMAND_HANDLERS = {
+    "init": cmd_init,
+    "encrypt": cmd_encrypt,
+    "decrypt": cmd_decrypt,
+    "plugins": cmd_plugins,
+    "session": cmd_session,
+    "upgrade": cmd_upgrade,
+    "serve": cmd_serve,
+    "yubikey": cmd_yubikey,
+}
+
+
 def main():
     # Check for plugin command BEFORE setting up argparse
     # This allows plugin commands like "gmail.unread" to work
-    if len(sys.argv) > 1 and "." in sys.argv[1] and not sys.argv[1].startswith("-"):
-        plugin_cmd = sys.argv[1]
-        if "." in plugin_cmd:
-            parts = plugin_cmd.split(".", 1)
-
-            # Create minimal args object for cmd_run
-            class Args:
-                pass
+    plugin_cmd = _parse_plugin_command(sys.argv[1]) if len(sys.argv) > 1 else None
+    if plugin_cmd is not None:
+        # Minimal args object for cmd_run; argparse is never imported on this path
+        plugin, command = plugin_cmd
+        return cmd_run(SimpleNamespace(plugin=plugin, command=command, args=sys.argv[2:]))
+
+    # `nakimi --version` needs no parser either
+    if sys.argv[1:] in (["--version"], ["-v"]):
+        cmd_version()
+        sys.exit(0)
 
-            args = Args()
-            args.plugin = parts[0]
-            args.command = parts[1]
-            args.args = sys.argv[2:]
-            return cmd_run(args)
+    parser = _build_parser(sys.argv[1] if len(sys.argv) > 1 else None)
+    args, remaining = parser.parse_known_args()
 
-    parser = argparse.ArgumentParser(
-        prog="nakimi",
-        description="Secure vault for API credentials with plugin-based integrations",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  %(prog)s init                          # Initialize vault
-  %(prog)s session                       # Start secure session
-  %(prog)s gmail.unread                  # List unread emails
-  %(prog)s gmail.search "from:boss"      # Search emails
-  %(prog)s plugins list                  # List available plugins
-  %(prog)s upgrade                       # Upgrade to latest version
+    # Handle --version flag
+    if args.version:
+        cmd_version()
+        sys.exit(0)
 
-YubiKey commands (optional):
-  %(prog)s yubikey setup                 # Initialize YubiKey
-  %(prog)s yubikey status                # Check YubiKey status
-  %(prog)s yubikey encrypt-key           # Encrypt age key with YubiKey
-        """,
-    )
+    if not args.cmd:
+        parser.print_help()
+        sys.exit(1)
 
-    # Add version flag
-    parser.add_argument("--version", "-v", action="store_true", help="Show version information")
+    # Route to appropriate handler
+    handler = _COMMAND_HANDLERS.get(args.cmd)
+    if handler:
+        handler(args)
+    else:
+        parser.print_help()
+        sys.exit(1)
 
-    subparsers = parser.add_subparsers(dest="cmd", help="Commands")
 
-    # init command
+def _add_init_parser(subparsers):
     subparsers.add_parser("init", help="Initialize vault and generate keys")
 
-    # encrypt command
+
+def _add_encrypt_parser(subparsers):
     encrypt_parser = subparsers.add_parser("encrypt", help="Encrypt a file")
     encrypt_parser.add_argument("file", help="File to encrypt")
     encrypt_parser.add_argument("-o", "--output", help="Output file")
@@ -566,26 +684,32 @@ YubiKey commands (optional):
         "--shred", action="store_true", help="Securely delete original after encryption"
     )
 
-    # decrypt command
+
+def _add_decrypt_parser(subparsers):
     decrypt_parser = subparsers.add_parser("decrypt", help="Decrypt a file")
     decrypt_parser.add_argument("file", help="File to decrypt")
     decrypt_parser.add_argument("-o", "--output", help="Output file")
     decrypt_parser.add_argument("--keep", action="store_true", help="Keep decrypted file")
 
-    # plugins command
+
+def _add_plugins_parser(subparsers):
     plugins_parser = subparsers.add_parser("plugins", help="Manage plugins")
     plugins_sub = plugins_parser.add_subparsers(dest="command", help="Plugin commands")
     plugins_sub.add_parser("list", help="List available plugins")
     plugins_sub.add_parser("commands", help="List available commands")
 
-    # session command
+
+def _add_session_parser(subparsers):
+    import argparse
+
     session_parser = subparsers.add_parser("session", help="Start secure session")
     session_parser.add_argument("--shell", action="store_true", help="Start shell instead of kimi")
     session_parser.add_argument(
         "--exec", dest="command", nargs=argparse.REMAINDER, help="Execute command and exit"
     )
 
-    # yubikey command
+
+def _add_yubikey_parser(subparsers):
     yubikey_parser = subparsers.add_parser("yubikey", help="YubiKey management and operations")
     yubikey_sub = yubikey_parser.add_subparsers(dest="yubikey_command", help="YubiKey commands")
 
@@ -599,7 +723,10 @@ YubiKey commands (optional):
     yubikey_sub.add_parser("status", help="Check YubiKey status and configuration")
 
     # yubikey encrypt-key
-    encrypt_parser = yubikey_sub.add_parser("encrypt-key", help="Encrypt existing age key with YubiKey")
+    encrypt_parser = yubikey_sub.add_parser(
+        "encrypt-key",
+        help="Encrypt existing age key with YubiKey",
+    )
     encrypt_parser.add_argument("--slot", default="9a", help="PIV slot to use (default: 9a)")
 
     # yubikey decrypt-key (for testing)
@@ -614,47 +741,72 @@ YubiKey commands (optional):
     change_parser.add_argument("old_pin", help="Current PIN")
     change_parser.add_argument("new_pin", help="New PIN")
 
-    # serve command (MCP server)
+
+def _add_serve_parser(subparsers):
     subparsers.add_parser("serve", help="Start MCP server for AI assistant integration")
 
-    # upgrade command
+
+def _add_upgrade_parser(subparsers):
     upgrade_parser = subparsers.add_parser("upgrade", help="Upgrade to latest version from GitHub")
     upgrade_parser.add_argument(
         "--version", dest="target_version", help="Specific version to upgrade to (default: latest)"
     )
 
-    # plugin command (direct invocation: nakimi gmail.unread)
-    # This is handled specially below
 
-    args, remaining = parser.parse_known_args()
+# Subparser builders, in --help order. Plugin commands (nakimi gmail.unread)
+# are dispatched at the top of main() before any parser is built.
+_PARSER_BUILDERS = {
+    "init": _add_init_parser,
+    "encrypt": _add_encrypt_parser,
+    "decrypt": _add_decrypt_parser,
+    "plugins": _add_plugins_parser,
+    "session": _add_session_parser,
+    "yubikey": _add_yubikey_parser,
+    "serve": _add_serve_parser,
+    "upgrade": _add_upgrade_parser,
+}
 
-    # Handle --version flag
-    if args.version:
-        cmd_version()
-        sys.exit(0)
 
-    if not args.cmd:
-        parser.print_help()
-        sys.exit(1)
+def _build_parser(command: Optional[str] = None):
+    """
+    Build the argparse parser for the built-in subcommands
 
-    # Route to appropriate handler
-    handlers = {
-        "init": cmd_init,
-        "encrypt": cmd_encrypt,
-        "decrypt": cmd_decrypt,
-        "plugins": cmd_plugins,
-        "session": cmd_session,
-        "upgrade": cmd_upgrade,
-        "serve": cmd_serve,
-        "yubikey": cmd_yubikey,
-    }
+    When a known command is given only its subparser is added; the full
+    tree is still built for --help, no command, or an unknown command.
+    """
+    import argparse
 
-    handler = handlers.get(args.cmd)
-    if handler:
-        handler(args)
+    parser = argparse.ArgumentParser(
+        prog="nakimi",
+        description="Secure vault for API credentials with plugin-based integrations",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s init                          # Initialize vault
+  %(prog)s session                       # Start secure session
+  %(prog)s gmail.unread                  # List unread emails
+  %(prog)s gmail.search "from:boss"      # Search emails
+  %(prog)s plugins list                  # List available plugins
+  %(prog)s upgrade                       # Upgrade to latest version
+
+YubiKey commands (optional):
+  %(prog)s yubikey setup                 # Initialize YubiKey
+  %(prog)s yubikey status                # Check YubiKey status
+  %(prog)s yubikey encrypt-key           # Encrypt age key with YubiKey
+        """,
+    )
+
+    # Add version flag
+    parser.add_argument("--version", "-v", action="store_true", help="Show version information")
+
+    subparsers = parser.add_subparsers(dest="cmd", help="Commands")
+    if command in _PARSER_BUILDERS:
+        _PARSER_BUILDERS[command](subparsers)
     else:
-        parser.print_help()
-        sys.exit(1)
+        for add_parser in _PARSER_BUILDERS.values():
+            add_parser(subparsers)
+
+    return parser
 
 
 if __name__ == "__main__":
@@ -1,10 +1,29 @@
 """
 Nakimi Core - Encryption, configuration, and plugin management
+
+Names are resolved from their submodules on first access, so importing the
+plugin system or config does not pull in the vault's crypto helpers.
 """
 
-from .vault import Vault, VaultCryptoError, secure_delete
-from .config import VaultConfig, get_config
-from .plugin import Plugin, PluginManager, PluginError
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .vault import Vault, VaultCryptoError, secure_delete
+    from .config import VaultConfig, get_config
+    from .plugin import Plugin, PluginManager, PluginError
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "Vault": ".vault",
+    "VaultCryptoError": ".vault",
+    "secure_delete": ".vault",
+    "VaultConfig": ".config",
+    "get_config": ".config",
+    "Plugin": ".plugin",
+    "PluginManager": ".plugin",
+    "PluginError": ".plugin",
+}
 
 __all__ = [
     "Vault",
@@ -16,3 +35,12 @@ __all__ = [
     "PluginManager",
     "PluginError",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -9,7 +9,33 @@ Supports configuration via:
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+
+# Parsed config files, keyed on (path, mtime_ns)
+_config_file_cache: Dict[Tuple[str, int], dict] = {}
+
+
+def _as_path(value: str) -> Path:
+    """Parse a path setting, expanding ~"""
+    return Path(value).expanduser()
+
+
+# Truthy spellings matched as-is, so the usual ones skip lower()
+_TRUTHY = frozenset({"true", "True", "TRUE", "yes", "Yes", "YES", "1", "on", "On", "ON"})
+
+
+def _as_bool(value: str) -> bool:
+    """Parse a boolean setting"""
+    return value in _TRUTHY or value.lower() in _TRUTHY
+
+
+def _as_seconds(value: str) -> float:
+    """Parse a duration setting in seconds; anything invalid or negative means 0 (off)"""
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return 0.0
 
 
 class VaultConfig:
@@ -19,110 +45,132 @@ class VaultConfig:
     DEFAULT_CONFIG_DIR = "~/.config/nakimi"
     DEFAULT_CONFIG_FILE = "config"
 
+    # Settings resolved with priority env var > config file > default:
+    # (attribute, env var, config file key, parser, default or default(self)).
+    # Path defaults depend on the vault dir, so it must come first.
+    _SETTINGS = (
+        (
+            "_vault_dir",
+            "NAKIMI_DIR",
+            "vault_dir",
+            _as_path,
+            lambda c: _as_path(c.DEFAULT_VAULT_DIR),
+        ),
+        ("_key_file", "NAKIMI_KEY", "key_file", _as_path, lambda c: c._vault_dir / "key.txt"),
+        (
+            "_secrets_file",
+            "NAKIMI_SECRETS",
+            "secrets_file",
+            _as_path,
+            lambda c: c._vault_dir / "secrets.json.age",
+        ),
+        ("_yubikey_enabled", "NAKIMI_YUBIKEY_ENABLED", "yubikey_enabled", _as_bool, False),
+        ("_yubikey_slot", "NAKIMI_YUBIKEY_SLOT", "yubikey_slot", str, "1"),
+        (
+            "_yubikey_require_touch",
+            "NAKIMI_YUBIKEY_REQUIRE_TOUCH",
+            "yubikey_require_touch",
+            _as_bool,
+            True,
+        ),
+        ("_yubikey_pin_prompt", "NAKIMI_YUBIKEY_PIN_PROMPT", "yubikey_pin_prompt", _as_bool, True),
+        ("_decrypt_cache_ttl", "NAKIMI_DECRYPT_CACHE_TTL", "decrypt_cache_ttl", _as_seconds, 0.0),
+    )
+
     def __init__(self):
         self._vault_dir: Optional[Path] = None
         self._config_dir: Optional[Path] = None
         self._config_file: Optional[Path] = None
         self._key_file: Optional[Path] = None
+        self._key_pub_file: Optional[Path] = None
         self._secrets_file: Optional[Path] = None
         self._yubikey_enabled: Optional[bool] = None
         self._yubikey_slot: Optional[str] = None
         self._yubikey_require_touch: Optional[bool] = None
         self._yubikey_pin_prompt: Optional[bool] = None
+        self._decrypt_cache_ttl: Optional[float] = None
         self._load_config()
 
     def _load_config(self):
         """Load configuration from env vars and/or config file"""
-        # Load config file first to get any config values
-        config_file_env = os.environ.get("NAKIMI_CONFIG")
+        environ = os.environ
+
+        # The config dir also locates the config file, so resolve it first
+        self._config_dir = _as_path(environ.get("NAKIMI_CONFIG_DIR") or self.DEFAULT_CONFIG_DIR)
+        config_file_env = environ.get("NAKIMI_CONFIG")
         if config_file_env:
-            self._config_file = Path(config_file_env).expanduser()
+            self._config_file = _as_path(config_file_env)
         else:
-            # Need a temporary config_dir to find config file
-            temp_config_dir = self._get_path_from_env("NAKIMI_CONFIG_DIR", self.DEFAULT_CONFIG_DIR)
-            self._config_file = temp_config_dir / self.DEFAULT_CONFIG_FILE
+            self._config_file = self._config_dir / self.DEFAULT_CONFIG_FILE
 
         # Load from config file if it exists
         config_values = self._read_config_file()
 
-        # Set paths (env var > config file > default)
-        self._vault_dir = self._get_path(
-            "NAKIMI_DIR", config_values.get("vault_dir"), Path(self.DEFAULT_VAULT_DIR).expanduser()
-        )
-        self._config_dir = self._get_path_from_env("NAKIMI_CONFIG_DIR", self.DEFAULT_CONFIG_DIR)
-
-        self._key_file = self._get_path(
-            "NAKIMI_KEY", config_values.get("key_file"), self._vault_dir / "key.txt"
-        )
-
-        self._secrets_file = self._get_path(
-            "NAKIMI_SECRETS",
-            config_values.get("secrets_file"),
-            self._vault_dir / "secrets.json.age",
-        )
-
-        # YubiKey settings (env var > config file > default)
-        self._yubikey_enabled = self._get_bool(
-            "NAKIMI_YUBIKEY_ENABLED", config_values.get("yubikey_enabled"), False
-        )
-        self._yubikey_slot = self._get_str("NAKIMI_YUBIKEY_SLOT", config_values.get("yubikey_slot"), "1")
-        self._yubikey_require_touch = self._get_bool(
-            "NAKIMI_YUBIKEY_REQUIRE_TOUCH", config_values.get("yubikey_require_touch"), True
-        )
-        self._yubikey_pin_prompt = self._get_bool(
-            "NAKIMI_YUBIKEY_PIN_PROMPT", config_values.get("yubikey_pin_prompt"), True
-        )
+        for attr, env_var, config_key, parse, default in self._SETTINGS:
+            value = environ.get(env_var) or config_values.get(config_key)
+            if value:
+                setattr(self, attr, parse(value))
+            else:
+                setattr(self, attr, default(self) if callable(default) else default)
 
-    def _get_path_from_env(self, env_var: str, default: str) -> Path:
-        """Get path from environment variable or use default"""
-        value = os.environ.get(env_var, default)
-        return Path(value).expanduser()
-
-    def _get_path(self, env_var: str, config_value: Optional[str], default: Path) -> Path:
-        """Get path with priority: env var > config file > default"""
-        if os.environ.get(env_var):
-            return Path(os.environ[env_var]).expanduser()
-        if config_value:
-            return Path(config_value).expanduser()
-        return default
-
-    def _get_bool(self, env_var: str, config_value: Optional[str], default: bool) -> bool:
-        """Get boolean value with priority: env var > config file > default"""
-        env_val = os.environ.get(env_var)
-        if env_val:
-            return env_val.lower() in ("true", "yes", "1", "on")
-        if config_value:
-            return config_value.lower() in ("true", "yes", "1", "on")
-        return default
-
-    def _get_str(self, env_var: str, config_value: Optional[str], default: str) -> str:
-        """Get string value with priority: env var > config file > default"""
-        env_val = os.environ.get(env_var)
-        if env_val:
-            return env_val
-        if config_value:
-            return config_value
-        return default
+        self._key_pub_file = Path(f"{self._key_file}.pub")
 
     def _read_config_file(self) -> dict:
         """Read configuration from file if it exists"""
-        if not self._config_file.exists():
+        # A single stat() both answers "is there a config file" and gives the
+        # cache key, so the common no-config case costs one failed syscall
+        try:
+            mtime_ns = self._config_file.stat().st_mtime_ns
+        except OSError:
             return {}
 
-        values = {}
+        key = (str(self._config_file), mtime_ns)
+        cached = _config_file_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            with open(self._config_file, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        values[key.strip()] = value.strip().strip("\"'")
-        except Exception:
-            pass
+            text = self._config_file.read_text()
+        except (OSError, UnicodeDecodeError):
+            return {}
+
+        values = {}
+        for line in text.splitlines() if text else ():
+            line = line.strip()
+            if not line or line[0] == "#":
+                continue
+            key_name, sep, value = line.partition("=")
+            if sep:
+                values[key_name.strip()] = value.strip().strip("\"'")
+        _config_file_cache[key] = values
         return values
 
+    def save_settings(self, values: Dict[str, str]):
+        """Persist settings to the config file, replacing existing keys in place"""
+        try:
+            lines = self._config_file.read_text().splitlines()
+        except (OSError, UnicodeDecodeError):
+            lines = []
+
+        pending = dict(values)
+        for i, line in enumerate(lines):
+            key_name, sep, _ = line.strip().partition("=")
+            key_name = key_name.strip()
+            if sep and key_name in pending:
+                lines[i] = f"{key_name}={pending.pop(key_name)}"
+        lines.extend(f"{key_name}={value}" for key_name, value in pending.items())
+
+        self._config_file.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd = os.open(self._config_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+        # The rewrite may land within the same mtime tick as the cached parse
+        path = str(self._config_file)
+        for key in [key for key in _config_file_cache if key[0] == path]:
+            del _config_file_cache[key]
+        self._load_config()
+
     @property
     def vault_dir(self) -> Path:
         """Directory where vault files are stored"""
@@ -133,6 +181,11 @@ class VaultConfig:
         """Directory for configuration files"""
         return self._config_dir
 
+    @property
+    def config_file(self) -> Path:
+        """Path to the configuration file"""
+        return self._config_file
+
     @property
     def key_file(self) -> Path:
         """Path to age private key"""
@@ -141,7 +194,7 @@ class VaultConfig:
     @property
     def key_pub_file(self) -> Path:
         """Path to age public key"""
-        return Path(str(self._key_file) + ".pub")
+        return self._key_pub_file
 
     @property
     def secrets_file(self) -> Path:
@@ -168,6 +221,11 @@ class VaultConfig:
         """Whether to prompt for PIN for YubiKey operations"""
         return self._yubikey_pin_prompt
 
+    @property
+    def decrypt_cache_ttl(self) -> float:
+        """Seconds to keep decrypted plaintexts in memory for reuse (0 disables the cache)"""
+        return self._decrypt_cache_ttl
+
     def ensure_directories(self):
         """Create necessary directories if they don't exist"""
         self._vault_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
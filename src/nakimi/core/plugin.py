@@ -6,9 +6,10 @@ Each plugin is self-contained with its own client and CLI commands.
 """
 
 import abc
+import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 
 
@@ -106,6 +107,10 @@ class PluginManager:
     Manages plugin discovery, loading, and execution.
     """
 
+    # Plugin classes found by discover_plugins(), shared by all managers in the process.
+    # Keyed on (plugins_dir, mtime) so adding or removing a plugin directory invalidates it.
+    _discovered_classes: Dict[Tuple[Path, int], Tuple[type, ...]] = {}
+
     def __init__(self, secrets_data: Optional[Dict[str, Any]] = None):
         """
         Initialize plugin manager.
@@ -116,6 +121,7 @@ class PluginManager:
         self.secrets_data = secrets_data or {}
         self._plugins: Dict[str, Plugin] = {}
         self._commands: Dict[str, tuple[str, PluginCommand]] = {}  # full_name -> (plugin_name, command)
+        self._commands_sorted: Optional[Tuple[str, ...]] = None  # rebuilt lazily after registration
 
     def register_plugin(self, plugin_class: type[Plugin], plugin_secrets: Optional[Dict] = None):
         """
@@ -148,6 +154,7 @@ class PluginManager:
             for cmd in plugin.get_commands():
                 full_name = f"{plugin_name}.{cmd.name}"
                 self._commands[full_name] = (plugin_name, cmd)
+            self._commands_sorted = None
 
         except PluginError as e:
             # Plugin failed to initialize (e.g., missing secrets)
@@ -159,34 +166,89 @@ class PluginManager:
 
         Plugins are loaded if they have corresponding secrets in the vault.
         """
-        from importlib import import_module
+        for plugin_class in self._discover_plugin_classes():
+            self.register_plugin(plugin_class)
 
+    @classmethod
+    def _discover_plugin_classes(cls) -> Tuple[type, ...]:
+        """
+        Find the Plugin subclass of every plugin package.
+
+        The result is cached per process, so repeated discovery skips the
+        directory walk and import loop.
+        """
         # Get the plugins directory
         import nakimi.plugins as plugins_pkg
 
         plugins_dir = Path(plugins_pkg.__file__).parent
+        key = (plugins_dir, plugins_dir.stat().st_mtime_ns)
+        cached = cls._discovered_classes.get(key)
+        if cached is not None:
+            return cached
 
-        # Find all plugin subdirectories
-        for item in plugins_dir.iterdir():
-            if item.is_dir() and not item.name.startswith("_"):
-                plugin_file = item / "plugin.py"
-                if not plugin_file.exists():
-                    # Skip directories without plugin.py (placeholder plugins)
-                    continue
+        classes = []
 
-                try:
-                    # Import the plugin module
-                    module = import_module(f"nakimi.plugins.{item.name}.plugin")
+        # Find all plugin subdirectories, in a stable order
+        for name in cls._list_plugin_names(plugins_dir):
+            plugin_class = cls._import_plugin_class(plugins_dir, name)
+            if plugin_class is not None:
+                classes.append(plugin_class)
 
-                    # Find the Plugin subclass
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if isinstance(attr, type) and issubclass(attr, Plugin) and attr is not Plugin:
-                            self.register_plugin(attr)
-                            break
+        cls._discovered_classes = {key: tuple(classes)}
+        return cls._discovered_classes[key]
 
-                except ImportError as e:
-                    print(f"Warning: Could not load plugin '{item.name}': {e}", file=sys.stderr)
+    @staticmethod
+    def _import_plugin_class(plugins_dir: Path, name: str) -> Optional[type]:
+        """Import nakimi.plugins.<name>.plugin and return its Plugin subclass, if any."""
+        from importlib import import_module
+
+        if not (plugins_dir / name / "plugin.py").exists():
+            # Skip directories without plugin.py (placeholder plugins)
+            return None
+
+        try:
+            # Import the plugin module
+            module = import_module(f"nakimi.plugins.{name}.plugin")
+        except ImportError as e:
+            print(f"Warning: Could not load plugin '{name}': {e}", file=sys.stderr)
+            return None
+
+        # Find the Plugin subclass
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if isinstance(attr, type) and issubclass(attr, Plugin) and attr is not Plugin:
+                return attr
+        return None
+
+    def load_plugin(self, name: str) -> bool:
+        """
+        Import and register a single plugin by name, skipping discovery of the rest.
+
+        Used for 'plugin.command' shortcuts, which only ever need one plugin.
+
+        Returns:
+            True if the plugin is loaded afterwards
+        """
+        if name in self._plugins:
+            return True
+        if not name.isidentifier() or name.startswith("_"):
+            return False
+
+        import nakimi.plugins as plugins_pkg
+
+        plugin_class = self._import_plugin_class(Path(plugins_pkg.__file__).parent, name)
+        if plugin_class is not None:
+            self.register_plugin(plugin_class)
+        return name in self._plugins
+
+    @staticmethod
+    def _list_plugin_names(plugins_dir: Path) -> Tuple[str, ...]:
+        """Return the sorted names of candidate plugin packages in plugins_dir."""
+        with os.scandir(plugins_dir) as entries:
+            names = sorted(
+                entry.name for entry in entries if entry.is_dir() and not entry.name.startswith("_")
+            )
+        return tuple(names)
 
     def get_plugin(self, name: str) -> Optional[Plugin]:
         """Get a loaded plugin by name"""
@@ -196,9 +258,15 @@ class PluginManager:
         """List names of loaded plugins"""
         return list(self._plugins.keys())
 
+    def _sorted_commands(self) -> Tuple[str, ...]:
+        """Sorted command names, cached until the next registration"""
+        if self._commands_sorted is None:
+            self._commands_sorted = tuple(sorted(self._commands))
+        return self._commands_sorted
+
     def list_commands(self) -> List[str]:
-        """List all available commands in 'plugin.command' format"""
-        return list(self._commands.keys())
+        """List all available commands in 'plugin.command' format, sorted"""
+        return list(self._sorted_commands())
 
     def execute_command(self, full_command: str, args: List[str]) -> Any:
         """
@@ -246,6 +314,7 @@ class PluginManager:
 
         # Show all commands
         lines = ["Available commands:"]
-        for full_name, (plugin_name, cmd) in sorted(self._commands.items()):
+        for full_name in self._sorted_commands():
+            _, cmd = self._commands[full_name]
             lines.append(f"  {full_name:30} - {cmd.description}")
         return "\n".join(lines)
@@ -2,16 +2,24 @@
 Core vault operations - encryption/decryption with age
 """
 
+import atexit
 import contextlib
+import errno
+import functools
 import logging
 import subprocess
 import tempfile
+import threading
+import time
 import os
 import platform
+import re
 import ctypes
 import mmap
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 # Optional YubiKey support
 try:
@@ -22,6 +30,31 @@ except ImportError:
     YUBIKEY_AVAILABLE = False
     YubiKeyManager = None
 
+# Optional in-process age implementation (pip install nakimi[pyrage])
+try:
+    import pyrage
+
+    PYRAGE_AVAILABLE = True
+except ImportError:
+    PYRAGE_AVAILABLE = False
+    pyrage = None
+
+
+# Set once `age --version` has succeeded, so later operations (from any
+# Vault instance) skip the fork+exec
+_age_installed = False
+
+
+def _as_path(path: Union[str, Path]) -> Path:
+    """Normalize a path argument; absolute Paths (never starting with ~) pass straight through"""
+    if isinstance(path, Path) and path.is_absolute():
+        return path
+    return Path(path).expanduser()
+
+
+# age-keygen reports "Public key: age1..." on stderr
+_PUBLIC_KEY_RE = re.compile(r"public key:\s*(age1\S+)", re.IGNORECASE)
+
 
 class VaultCryptoError(Exception):
     """Raised when encryption/decryption operations fail"""
@@ -29,26 +62,130 @@ class VaultCryptoError(Exception):
     pass
 
 
-def can_mlock() -> bool:
-    """Check if current user can use mlock to prevent swapping"""
+# resource.RLIM_INFINITY is -1, so an unlimited RLIMIT_MEMLOCK has to be
+# checked for explicitly rather than compared as a byte count
+try:
+    from resource import RLIM_INFINITY
+except ImportError:
+    RLIM_INFINITY = -1
+
+
+def _read_mlock_limit() -> int:
+    """Read the soft RLIMIT_MEMLOCK, or 0 where it cannot be queried"""
     try:
         import resource
 
         soft, _ = resource.getrlimit(resource.RLIMIT_MEMLOCK)
-        return soft > 0
+        return soft
     except (ImportError, OSError):
-        return False
+        return 0
+
+
+# The limit is fixed for the life of the process, so query it once at import
+_MLOCK_LIMIT = _read_mlock_limit()
+_CAN_MLOCK = _MLOCK_LIMIT > 0 or _MLOCK_LIMIT == RLIM_INFINITY
+
+
+def can_mlock() -> bool:
+    """Check if current user can use mlock to prevent swapping"""
+    return _CAN_MLOCK
 
 
 def get_mlock_limit() -> int:
-    """Get maximum memory this user can lock (in bytes)"""
+    """Get maximum memory this user can lock (in bytes), RLIM_INFINITY if unlimited"""
+    return _MLOCK_LIMIT
+
+
+def _load_libc():
+    """Load libc with mlock bound, or None where it is unavailable"""
+    import ctypes.util
+
     try:
-        import resource
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.mlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        libc.mlock.restype = ctypes.c_int
+        libc.munlock.argtypes = libc.mlock.argtypes
+        libc.munlock.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+
+    # mlock2 (glibc 2.27+) is optional; mlock is the fallback
+    try:
+        libc.mlock2.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint]
+        libc.mlock2.restype = ctypes.c_int
+    except AttributeError:
+        pass
+    return libc
 
-        soft, _ = resource.getrlimit(resource.RLIMIT_MEMLOCK)
-        return soft
-    except (ImportError, OSError):
-        return 0
+
+# mlock2 flag: lock pages as they fault in instead of prefaulting the range
+MLOCK_ONFAULT = 1
+
+
+def _mlock_range(address: int, size: int) -> bool:
+    """
+    Lock a mapped range, preferring mlock2(MLOCK_ONFAULT) over mlock.
+
+    ONFAULT only locks pages as they are touched, so this is only for ranges
+    whose pages have already been written (the decrypt cache).
+    """
+    mlock2 = getattr(_libc, "mlock2", None)
+    if mlock2 is not None:
+        if mlock2(address, size, MLOCK_ONFAULT) == 0:
+            return True
+        # Old kernels reject the syscall or the flag; retry with plain mlock
+        if ctypes.get_errno() not in (errno.ENOSYS, errno.EINVAL):
+            return False
+    return _libc.mlock(address, size) == 0
+
+
+# dlopen and symbol binding happen once, not per mlock_file call
+_libc = _load_libc() if _CAN_MLOCK else None
+
+
+# path -> (mmap, ctypes view), kept alive so their pages stay locked
+_locked_mappings: Dict[str, Tuple[mmap.mmap, ctypes.Array]] = {}
+# Bytes (whole pages) locked so far, counted against RLIMIT_MEMLOCK
+_locked_bytes = 0
+
+
+def _page_round(size: int) -> int:
+    """Bytes mlock actually pins for a mapping of size bytes"""
+    return -(-size // mmap.PAGESIZE) * mmap.PAGESIZE
+
+
+def _within_mlock_budget(size: int) -> bool:
+    """Check that locking size more bytes stays under RLIMIT_MEMLOCK (always, if unlimited)"""
+    return _MLOCK_LIMIT == RLIM_INFINITY or _locked_bytes + size <= _MLOCK_LIMIT
+
+
+# mlockall flags
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+MCL_ONFAULT = 4
+
+# Set once mlockall() has succeeded for this process
+_memory_locked = False
+
+
+def _mlockall() -> bool:
+    """Lock the whole address space, now and future, or return False"""
+    global _memory_locked
+    if _memory_locked:
+        return True
+    # With MCL_FUTURE every later mapping counts against RLIMIT_MEMLOCK, so
+    # under a finite limit the interpreter's own allocations would start failing
+    if _libc is None or _MLOCK_LIMIT != RLIM_INFINITY:
+        return False
+
+    if _libc.mlockall(MCL_CURRENT | MCL_FUTURE | MCL_ONFAULT) != 0:
+        # Kernels before 4.4 reject MCL_ONFAULT
+        if ctypes.get_errno() not in (errno.ENOSYS, errno.EINVAL):
+            return False
+        if _libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+            return False
+    _memory_locked = True
+    return True
 
 
 def mlock_file(file_path: Union[str, Path]) -> bool:
@@ -56,7 +193,8 @@ def mlock_file(file_path: Union[str, Path]) -> bool:
     Prevent a file from being swapped to disk using mlock.
 
     This locks the file's pages in RAM, preventing them from being
-    written to swap even under memory pressure.
+    written to swap even under memory pressure. The lock is held until
+    munlock_file() (secure_delete calls it) or process exit.
 
     Args:
         file_path: Path to file to lock in memory
@@ -64,42 +202,143 @@ def mlock_file(file_path: Union[str, Path]) -> bool:
     Returns:
         True if successful, False otherwise (no error raised)
     """
-    if not can_mlock():
+    global _locked_bytes
+    if not can_mlock() or _libc is None:
         return False
 
+    key = os.fspath(file_path)
+    if key in _locked_mappings:
+        return True
     try:
-        path = Path(file_path)
-        if not path.exists():
-            return False
+        size = os.stat(key).st_size
+    except OSError:
+        return False
 
-        # Get file size
-        size = path.stat().st_size
-        limit = get_mlock_limit()
+    # Refuse up front what would exceed the remaining budget, before any open/mmap
+    if size == 0 or not _within_mlock_budget(_page_round(size)):
+        return False
 
-        if size > limit:
-            # File too large to lock
+    try:
+        # Lock a shared mapping of the file. from_buffer() needs a writable
+        # map, and the map must stay open: munmap drops the lock. Plain mlock
+        # faults the whole range in; MLOCK_ONFAULT would lock none of this
+        # freshly mapped, untouched range and leave the file swappable.
+        with open(key, "r+b") as f:
+            mm = mmap.mmap(f.fileno(), size)
+        buf = (ctypes.c_char * size).from_buffer(mm)
+        if _libc.mlock(ctypes.addressof(buf), size) != 0:
+            del buf
+            mm.close()
             return False
+    except Exception:
+        return False
 
-        # Memory map the file and lock it
-        with open(path, "rb") as f:
-            with mmap.mmap(f.fileno(), 0, mmap.MAP_SHARED, mmap.PROT_READ) as mm:
-                # Set up mlock call
-                libc = ctypes.CDLL("libc.so.6")
-                libc.mlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
-                libc.mlock.restype = ctypes.c_int
+    _locked_mappings[key] = (mm, buf)
+    _locked_bytes += _page_round(size)
+    return True
 
-                # Lock the memory
-                addr = ctypes.c_void_p(ctypes.addressof(ctypes.c_char.from_buffer(mm)))
-                result = libc.mlock(addr, mm.size())
 
-                # Note: mmap will be unmapped when we exit 'with' block,
-                # but the pages may stay locked in RAM until process exits
-                return result == 0
+def _unlock_mapping(key: str):
+    """munlock and unmap one mlock_file() mapping, returning its pages to the budget"""
+    global _locked_bytes
+    mm, buf = _locked_mappings.pop(key)
+    size = ctypes.sizeof(buf)
+    _libc.munlock(ctypes.addressof(buf), size)
+    del buf
+    mm.close()
+    _locked_bytes -= _page_round(size)
+
+
+def munlock_file(file_path: Union[str, Path]):
+    """Release the lock mlock_file() took on a file, if any"""
+    key = os.fspath(file_path)
+    if key in _locked_mappings:
+        _unlock_mapping(key)
+
+
+def _release_locked_mappings():
+    """munlock and unmap everything mlock_file locked"""
+    for key in list(_locked_mappings):
+        _unlock_mapping(key)
+
+
+if _libc is not None:
+    atexit.register(_release_locked_mappings)
+
+
+# decrypt_to_bytes() results, only kept when decrypt_cache_ttl is set:
+# (path, mtime_ns, key path, key mtime_ns) -> (monotonic expiry, pages,
+# length, locked). Each plaintext gets its own anonymous page-aligned mapping,
+# so it can be zeroed and mlocked (within the RLIMIT_MEMLOCK budget) without
+# sharing pages with anything else.
+DECRYPT_CACHE_SIZE = 64
+_decrypt_cache: "OrderedDict[tuple, Tuple[float, mmap.mmap, int, bool]]" = OrderedDict()
+_decrypt_cache_lock = threading.Lock()
 
-    except Exception:
-        return False
 
+def _wipe(buf: bytearray):
+    """Overwrite a plaintext buffer in place before it is dropped"""
+    buf[:] = bytes(len(buf))
 
+
+def _lock_pages(pages: mmap.mmap, lock: bool = True) -> bool:
+    """mlock (or munlock) a whole anonymous mapping, keeping _locked_bytes in step"""
+    global _locked_bytes
+    size = len(pages)
+    if lock and (_libc is None or not _within_mlock_budget(size)):
+        return False
+    # The view only yields the address; it must be gone before the map can close
+    view = (ctypes.c_char * size).from_buffer(pages)
+    address = ctypes.addressof(view)
+    del view
+    if not lock:
+        _libc.munlock(address, size)
+        _locked_bytes -= size
+        return True
+    if not _mlock_range(address, size):
+        return False
+    _locked_bytes += size
+    return True
+
+
+def _drop_cache_entry(entry: Tuple[float, mmap.mmap, int, bool]):
+    """Zero, unlock and unmap a cached plaintext"""
+    _, pages, _, locked = entry
+    pages[:] = bytes(len(pages))
+    if locked:
+        _lock_pages(pages, lock=False)
+    pages.close()
+
+
+def _decrypt_cache_get(key: tuple) -> Optional[bytes]:
+    """Return a live cached plaintext, dropping it if it has expired"""
+    with _decrypt_cache_lock:
+        entry = _decrypt_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            _drop_cache_entry(_decrypt_cache.pop(key))
+            return None
+        _decrypt_cache.move_to_end(key)
+        return entry[1][: entry[2]]
+
+
+def _decrypt_cache_put(key: tuple, plaintext: bytes, ttl: float):
+    """Cache a plaintext, evicting the least recently used entries beyond DECRYPT_CACHE_SIZE"""
+    # Anonymous mappings are page-aligned and never shared with other objects
+    pages = mmap.mmap(-1, _page_round(max(len(plaintext), 1)))
+    pages[: len(plaintext)] = plaintext
+    locked = _lock_pages(pages)
+    with _decrypt_cache_lock:
+        old = _decrypt_cache.pop(key, None)
+        if old is not None:
+            _drop_cache_entry(old)
+        _decrypt_cache[key] = (time.monotonic() + ttl, pages, len(plaintext), locked)
+        while len(_decrypt_cache) > DECRYPT_CACHE_SIZE:
+            _drop_cache_entry(_decrypt_cache.popitem(last=False)[1])
+
+
+@functools.lru_cache(maxsize=None)
 def get_secure_temp_dir() -> Optional[Path]:
     """
     Get the best available secure temp directory.
@@ -109,10 +348,13 @@ def get_secure_temp_dir() -> Optional[Path]:
     2. /private/tmp (RAM-backed on macOS)
     3. System temp (fallback - may hit disk)
 
-    Returns None if no secure option available.
+    Returns None if no secure option available. The probe writes a test
+    file, so it runs once per process and the answer is cached.
     """
+    system = platform.system()
+
     # Linux: /dev/shm is a RAM-backed tmpfs
-    if platform.system() == "Linux":
+    if system == "Linux":
         shm_path = Path("/dev/shm")
         if shm_path.exists() and shm_path.is_dir():
             # Check if we can write to it
@@ -125,7 +367,7 @@ def get_secure_temp_dir() -> Optional[Path]:
                 pass
 
     # macOS: /private/tmp is usually RAM-backed
-    if platform.system() == "Darwin":
+    if system == "Darwin":
         mac_tmp = Path("/private/tmp")
         if mac_tmp.exists() and mac_tmp.is_dir():
             return mac_tmp
@@ -134,6 +376,155 @@ def get_secure_temp_dir() -> Optional[Path]:
     return None
 
 
+def _create_private_file(path: Path) -> bool:
+    """
+    Make sure path exists with mode 0600 before plaintext is written to it.
+
+    age and pyrage truncate and reuse an existing output file, so creating
+    it first means the plaintext is never readable under a looser mode, as
+    it would be between their umask-mode create and a later chmod.
+
+    Returns:
+        True if the file was created here, False if it already existed
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        created = True
+    except FileExistsError:
+        fd = os.open(path, os.O_WRONLY)
+        created = False
+    try:
+        os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+    return created
+
+
+def write_secure_temp_file(data: bytes, prefix: str, suffix: str) -> Path:
+    """
+    Write data to a new private (0600) temp file, in RAM when possible.
+
+    Args:
+        data: Bytes to write
+        prefix: Temp file name prefix
+        suffix: Temp file name suffix
+
+    Returns:
+        Path to the temp file (caller must secure_delete it)
+    """
+    temp_dir = get_secure_temp_dir()
+    if temp_dir:
+        fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=suffix, dir=str(temp_dir))
+    else:
+        fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=suffix)
+    temp_path = Path(temp_path)
+
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+    # Secure permissions
+    os.chmod(temp_path, 0o600)
+
+    # Try to lock in memory
+    if temp_dir and can_mlock():
+        mlock_file(temp_path)
+
+    return temp_path
+
+
+def _open_anonymous_file(name: str, seal: bool = False) -> Optional[int]:
+    """Open a nameless read/write file: memfd_create, else O_TMPFILE in the secure temp dir"""
+    if hasattr(os, "memfd_create"):
+        flags = os.MFD_CLOEXEC | (os.MFD_ALLOW_SEALING if seal else 0)
+        try:
+            return os.memfd_create(name, flags)
+        except OSError:
+            pass
+
+    if hasattr(os, "O_TMPFILE"):
+        # An unlinked inode with no dirent; freed when the last descriptor closes
+        temp_dir = get_secure_temp_dir() or tempfile.gettempdir()
+        try:
+            return os.open(temp_dir, os.O_TMPFILE | os.O_RDWR, 0o600)
+        except OSError:
+            pass
+    return None
+
+
+def _run_to_memory(cmd: List[str]) -> bytes:
+    """
+    Run a command and return its stdout without it touching disk.
+
+    The child writes straight into a memfd, which is then read back through
+    a single mmap copy instead of pipe reads plus a join. Without memfd
+    support stdout is captured through a pipe.
+
+    Raises:
+        subprocess.CalledProcessError: If the command fails (stderr as bytes)
+    """
+    try:
+        fd = os.memfd_create("nakimi-age-out", os.MFD_CLOEXEC)
+    except (AttributeError, OSError):
+        return subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, check=True).stdout
+
+    try:
+        subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=fd, stderr=subprocess.PIPE, check=True)
+        size = os.fstat(fd).st_size
+        if not size:
+            return b""
+        with mmap.mmap(fd, size, prot=mmap.PROT_READ) as mm:
+            return mm[:]
+    finally:
+        # Zero the memfd pages before they go back to the kernel, including
+        # any partial plaintext written before the command failed
+        size = os.fstat(fd).st_size
+        if size:
+            os.pwrite(fd, bytes(size), 0)
+        os.close(fd)
+
+
+def create_memfd(data: bytes, name: str, seal: bool = False) -> Optional[int]:
+    """
+    Write data to an anonymous RAM-backed file (Linux memfd_create).
+
+    The file has no name on any filesystem, so there is nothing to
+    unlink or shred: it is gone once the descriptor is closed. While
+    open it can be read through /proc/<pid>/fd/<fd>. Kernels without
+    memfd_create get an O_TMPFILE inode in the secure temp dir instead.
+
+    Args:
+        data: Bytes to write
+        name: Debugging name shown in /proc/<pid>/fd
+        seal: Seal a memfd against any further writes or resizing, so
+            readers (e.g. session children) cannot alter it (best effort)
+
+    Returns:
+        File descriptor (caller must close it), or None if no anonymous file is available
+    """
+    if not os.path.isdir("/proc/self/fd"):
+        return None
+
+    fd = _open_anonymous_file(name, seal)
+    if fd is None:
+        return None
+
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    except OSError:
+        os.close(fd)
+        return None
+
+    if seal:
+        import fcntl
+
+        seals = fcntl.F_SEAL_SHRINK | fcntl.F_SEAL_GROW | fcntl.F_SEAL_WRITE | fcntl.F_SEAL_SEAL
+        with contextlib.suppress(OSError, AttributeError):
+            fcntl.fcntl(fd, fcntl.F_ADD_SEALS, seals)
+    return fd
+
+
 class Vault:
     """
     Core vault for managing encrypted secrets.
@@ -146,6 +537,7 @@ class Vault:
         self,
         key_file: Optional[Union[str, Path]] = None,
         vault_dir: Optional[Union[str, Path]] = None,
+        lock_memory: bool = False,
     ):
         """
         Initialize vault.
@@ -153,7 +545,11 @@ class Vault:
         Args:
             key_file: Path to age private key (default: ~/.nakimi/key.txt)
             vault_dir: Directory for vault files (default: ~/.nakimi)
+            lock_memory: Lock the whole process in RAM (see enable_memory_protection)
         """
+        if lock_memory:
+            self.enable_memory_protection()
+
         # Load config for defaults
         from .config import get_config
 
@@ -183,119 +579,221 @@ class Vault:
         # Final assignments with fallbacks
         self.vault_dir = vault_dir if vault_dir else Path.home() / ".nakimi"
         self.key_file = key_file if key_file else self.vault_dir / "key.txt"
-        self.key_pub_file = Path(str(self.key_file) + ".pub")
-
-        # Initialize YubiKey manager if available and enabled
+        # String form of the key path, reused for argv and the .pub file name
+        self._key_file_str = os.fspath(self.key_file)
+        self.key_pub_file = Path(self._key_file_str + ".pub")
+
+        # Parsed age identity for the pyrage backend, loaded on first decrypt
+        self._identity = None
+        # Public key, read on first use by get_public_key()
+        self._public_key: Optional[str] = None
+        # Secret key held for the duration of a decrypt_session()
+        self._session_key: Optional[str] = None
+
+        # YubiKey manager, created (and the hardware probed) only once a key
+        # file turns out not to be a plaintext age key
         self.yubikey_manager = None
-        if YUBIKEY_AVAILABLE and config.yubikey_enabled:
+        self._yubikey_pending = YUBIKEY_AVAILABLE and config.yubikey_enabled
+
+    @classmethod
+    def enable_memory_protection(cls) -> bool:
+        """
+        Keep the whole process out of swap with mlockall(MCL_CURRENT | MCL_FUTURE | MCL_ONFAULT).
+
+        Unlike mlock_file(), this also covers plaintext held in Python objects
+        (decrypted bytes, parsed JSON strings). It is only attempted when
+        RLIMIT_MEMLOCK is unlimited; otherwise mlock_file() remains the
+        fine-grained alternative.
+
+        Returns:
+            True if the process memory is locked, False otherwise (no error raised)
+        """
+        return _mlockall()
+
+    def _ensure_yubikey(self):
+        """Return the YubiKey manager, probing for the hardware on first use"""
+        if self._yubikey_pending:
+            self._yubikey_pending = False
+            logger = logging.getLogger(__name__)
             try:
-                self.yubikey_manager = YubiKeyManager(config)
+                manager = YubiKeyManager(self.config)
                 # Check if YubiKey is actually available (hardware present)
-                if not self.yubikey_manager.is_available():
-                    self.yubikey_manager = None
-                    logger = logging.getLogger(__name__)
+                if manager.is_available():
+                    self.yubikey_manager = manager
+                else:
                     logger.debug("YubiKey enabled in config but not available")
             except Exception as e:
-                logger = logging.getLogger(__name__)
                 logger.warning(f"Failed to initialize YubiKey manager: {e}")
-                self.yubikey_manager = None
+        return self.yubikey_manager
 
-    def _get_decrypted_key_path(self) -> Path:
+    def _decrypt_yubikey_key(self) -> Optional[bytearray]:
         """
-        Get path to decrypted age private key file.
-
-        If YubiKey is enabled and key file is encrypted with YubiKey,
-        decrypts it to a secure temporary file. Otherwise returns
-        the original key file path.
+        Decrypt a YubiKey-protected age private key.
 
         Returns:
-            Path to key file that age can read
+            Decrypted key bytes, or None if the key file is a plaintext age key
 
         Raises:
-            VaultCryptoError if decryption fails
+            VaultCryptoError if the key file is missing or decryption fails
         """
         # Check if key file exists
         if not self.key_file.exists():
             raise VaultCryptoError(f"Private key not found: {self.key_file}")
 
-        if not self.yubikey_manager:
-            # No YubiKey manager - assume key file is plaintext
-            return self.key_file
+        if not self.yubikey_manager and not self._yubikey_pending:
+            # YubiKey not in use - assume key file is plaintext
+            return None
 
-        # Read key file content
+        # Read key file content once: it is a few hundred bytes, and an
+        # encrypted key is needed in full for the YubiKey anyway
         with open(self.key_file, "rb") as f:
             key_data = f.read()
 
-        # Try to parse as age key (look for AGE-SECRET-KEY- prefix)
-        # If parsing fails, assume it's encrypted with YubiKey
-        try:
-            key_text = key_data.decode("utf-8")
-            if "AGE-SECRET-KEY-" in key_text:
-                # Already plaintext age key
-                return self.key_file
-        except UnicodeDecodeError:
-            # Binary data - likely encrypted
-            pass
+        # A plaintext age key carries the AGE-SECRET-KEY- prefix (after the
+        # comment header, so a short peek is not enough); match on the bytes
+        # rather than decoding them first
+        if b"AGE-SECRET-KEY-" in key_data:
+            return None
+
+        yubikey_manager = self._ensure_yubikey()
+        if not yubikey_manager:
+            # No YubiKey present - treat the key file as plaintext, as before
+            return None
 
         # Decrypt with YubiKey
         try:
-            decrypted_key = self.yubikey_manager.decrypt_age_key(key_data)
+            decrypted_key = yubikey_manager.decrypt_age_key(key_data)
         except Exception as e:
             raise VaultCryptoError(f"YubiKey decryption failed: {e}")
+        # Mutable, so callers can wipe it once it has been handed to age
+        return bytearray(decrypted_key.encode("utf-8"))
 
-        # Create secure temporary file for decrypted key
-        temp_dir = get_secure_temp_dir()
-        if temp_dir:
-            fd, temp_path = tempfile.mkstemp(prefix="nakimi-key-", suffix=".txt", dir=str(temp_dir))
-        else:
-            fd, temp_path = tempfile.mkstemp(prefix="nakimi-key-", suffix=".txt")
-        os.close(fd)
-        temp_path = Path(temp_path)
+    @contextlib.contextmanager
+    def _with_decrypted_key(self):
+        """
+        Context manager that yields a decrypted key file path.
+
+        A YubiKey-decrypted key is held in an anonymous memfd where
+        available, so it never gets a filesystem name. Otherwise it falls
+        back to a secure temp file. Either way it is cleaned up after use.
+
+        Yields:
+            Path to decrypted key file
+        """
+        decrypted_key = self._decrypt_yubikey_key()
+        if decrypted_key is None:
+            yield self.key_file
+            return
+
+        try:
+            fd = create_memfd(decrypted_key, "nakimi-key")
+            if fd is None:
+                key_path = write_secure_temp_file(
+                    decrypted_key,
+                    prefix="nakimi-key-",
+                    suffix=".txt",
+                )
+        finally:
+            # The only copy left in this process is the one in the file
+            size = len(decrypted_key)
+            _wipe(decrypted_key)
+
+        if fd is not None:
+            try:
+                # Readable by this process and its children (same user) while fd is open
+                yield Path(f"/proc/{os.getpid()}/fd/{fd}")
+            finally:
+                # memfd pages go back to the kernel as-is, so zero them first
+                with contextlib.suppress(OSError):
+                    os.pwrite(fd, bytes(size), 0)
+                os.close(fd)
+            return
+
+        try:
+            yield key_path
+        finally:
+            # secure_delete only unlinks on tmpfs; a key is worth one overwrite there too
+            _overwrite_file(key_path)
+            secure_delete(key_path)
 
-        # Write decrypted key
-        with open(temp_path, "w") as f:
-            f.write(decrypted_key)
+    def _get_identity(self):
+        """
+        Get the parsed age identity for the pyrage backend.
+
+        The key file (or its YubiKey-decrypted copy) is read and parsed once
+        per Vault instance.
+        """
+        if self._identity is None:
+            secret_key = self._read_secret_key()
+            try:
+                self._identity = pyrage.x25519.Identity.from_str(secret_key)
+            except Exception as e:
+                raise VaultCryptoError(f"Invalid age identity in {self.key_file}: {e}")
 
-        # Secure permissions
-        os.chmod(temp_path, 0o600)
+        return self._identity
 
-        # Try to lock in memory
-        if temp_dir and can_mlock():
-            mlock_file(temp_path)
+    def _read_secret_key(self) -> str:
+        """Return the AGE-SECRET-KEY-1... line from the key file (or its YubiKey-decrypted copy)"""
+        if self._session_key is not None:
+            return self._session_key
+        with self._with_decrypted_key() as key_path:
+            key_text = key_path.read_text()
 
-        # Store reference for cleanup (could use atexit or context manager)
-        # For now, caller must handle cleanup
-        return temp_path
+        for line in key_text.splitlines():
+            if line.startswith("AGE-SECRET-KEY-"):
+                return line.strip()
+        raise VaultCryptoError(f"No age identity found in {self.key_file}")
 
     @contextlib.contextmanager
-    def _with_decrypted_key(self):
+    def decrypt_session(self):
         """
-        Context manager that yields a decrypted key file path.
+        Context manager for decrypting many files with one identity load.
 
-        Ensures temporary key files are cleaned up after use.
+        The key file (or YubiKey) is read once on entry. Inside the block
+        decrypt_to_bytes() runs in-process, with pyrage or else the
+        `cryptography` package, instead of spawning age per file. The key
+        is dropped on exit. Without an in-process backend this is a no-op.
 
         Yields:
-            Path to decrypted key file
+            This vault
         """
-        key_path = self._get_decrypted_key_path()
+        from . import age_stream
+
+        in_process = PYRAGE_AVAILABLE or age_stream.CRYPTOGRAPHY_AVAILABLE
+        if self._session_key is not None or not in_process:
+            yield self
+            return
+
+        self._session_key = self._read_secret_key()
         try:
-            yield key_path
+            yield self
         finally:
-            # Clean up temporary key file if it's not the original key file
-            if key_path != self.key_file and key_path.exists():
-                # Use secure delete if possible
-                secure_delete(key_path)
+            self._session_key = None
 
     def _check_age_installed(self):
-        """Check if age is installed"""
+        """Check if age is installed (only the first success in the process is probed)"""
+        global _age_installed
+        if _age_installed:
+            return
         try:
-            subprocess.run(["age", "--version"], capture_output=True, check=True)
+            subprocess.run(
+                ["age", "--version"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=True,
+            )
         except (subprocess.CalledProcessError, FileNotFoundError):
             raise VaultCryptoError("age is not installed. Install it from https://age-encryption.org")
+        _age_installed = True
+
+    def _check_backend(self):
+        """Check that an age implementation (pyrage or the age CLI) is available"""
+        if not PYRAGE_AVAILABLE:
+            self._check_age_installed()
 
     def generate_key(self) -> str:
         """Generate a new age key pair"""
-        self._check_age_installed()
+        self._check_backend()
 
         if self.key_file.exists():
             raise VaultCryptoError(
@@ -306,52 +804,82 @@ class Vault:
         # Ensure vault directory exists
         self.vault_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
 
+        if PYRAGE_AVAILABLE:
+            public_key = self._generate_key_in_process()
+        else:
+            public_key = self._generate_key_with_age()
+
+        # Create .pub file
+        if public_key:
+            self.key_pub_file.write_text(public_key + "\n")
+
+        # Secure the key file
+        os.chmod(self.key_file, 0o600)
+
+        # Drop anything cached from a previous key
+        self._public_key = public_key
+        if not PYRAGE_AVAILABLE:
+            self._identity = None
+
+        return public_key
+
+    def _generate_key_in_process(self) -> str:
+        """Generate the key pair with pyrage, writing the same file format as age-keygen"""
+        identity = pyrage.x25519.Identity.generate()
+        public_key = str(identity.to_public())
+        created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        key_text = f"# created: {created}\n# public key: {public_key}\n{identity}\n"
+
+        # Create with 0600 from the start so the secret is never world-readable
+        fd = os.open(self.key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(key_text)
+
+        self._identity = identity
+        return public_key
+
+    def _generate_key_with_age(self) -> Optional[str]:
+        """Generate the key pair with the age-keygen CLI"""
         try:
             result = subprocess.run(
-                ["age-keygen", "-o", str(self.key_file)], capture_output=True, text=True, check=True
+                ["age-keygen", "-o", self._key_file_str], capture_output=True, text=True, check=True
             )
-            # Extract public key from stderr output
-            public_key = None
-            for line in result.stderr.split("\n"):
-                if "public key:" in line:
-                    public_key = line.split("public key:")[1].strip()
-                    break
-
-            # Also read from key file if not in stderr
-            if not public_key:
-                with open(self.key_file, "r") as f:
-                    for line in f:
-                        if line.startswith("# public key:"):
-                            public_key = line.split(":")[1].strip()
-                            break
-
-            # Create .pub file
-            if public_key:
-                with open(self.key_pub_file, "w") as f:
-                    f.write(public_key + "\n")
-
-            # Secure the key file
-            os.chmod(self.key_file, 0o600)
-
-            return public_key
-
         except subprocess.CalledProcessError as e:
             raise VaultCryptoError(f"Failed to generate key: {e.stderr}")
 
+        # Extract public key from stderr output ("Public key: age1...")
+        match = _PUBLIC_KEY_RE.search(result.stderr)
+        if match:
+            return match.group(1)
+
+        # Also read from key file if not in stderr
+        try:
+            return self._read_public_key()
+        except VaultCryptoError:
+            return None
+
     def get_public_key(self) -> str:
         """Get the public key from the .pub file or derive from private key"""
+        if self._public_key is None:
+            self._public_key = self._read_public_key()
+        return self._public_key
+
+    def _read_public_key(self) -> str:
+        """Read the public key from the .pub file or the private key's comment header"""
         if self.key_pub_file.exists():
-            with open(self.key_pub_file, "r") as f:
-                return f.read().strip()
+            return self.key_pub_file.read_text().strip()
 
         # Derive from private key
         if not self.key_file.exists():
             raise VaultCryptoError(f"Key file not found: {self.key_file}")
 
-        with open(self.key_file, "r") as f:
-            for line in f:
-                if line.startswith("# public key:"):
-                    return line.split(":")[1].strip()
+        # age-keygen puts the comment within the first ~100 bytes, so a small
+        # fixed window is enough. Bytes, so a YubiKey-encrypted key simply has no match
+        with open(self.key_file, "rb") as f:
+            head = f.read(256)
+        _, marker, rest = head.partition(b"# public key:")
+        if marker:
+            return rest.partition(b"\n")[0].strip().decode("utf-8")
 
         raise VaultCryptoError("Could not find public key")
 
@@ -372,29 +900,185 @@ class Vault:
         Returns:
             Path to encrypted file
         """
-        self._check_age_installed()
+        self._check_backend()
 
-        input_path = Path(plaintext_path).expanduser()
+        input_path = _as_path(plaintext_path)
         if not input_path.exists():
             raise VaultCryptoError(f"Input file not found: {input_path}")
 
         if ciphertext_path is None:
-            output_path = Path(str(input_path) + ".age")
+            output_path = input_path.with_name(input_path.name + ".age")
         else:
-            output_path = Path(ciphertext_path).expanduser()
+            output_path = _as_path(ciphertext_path)
 
         pub_key = recipient or self.get_public_key()
 
+        if PYRAGE_AVAILABLE:
+            try:
+                recipients = [pyrage.x25519.Recipient.from_str(pub_key)]
+                pyrage.encrypt_file(os.fspath(input_path), os.fspath(output_path), recipients)
+                return output_path
+            except Exception as e:
+                raise VaultCryptoError(f"Encryption failed: {e}")
+
         try:
             subprocess.run(
-                ["age", "-r", pub_key, "-o", str(output_path), str(input_path)],
+                ["age", "-r", pub_key, "-o", os.fspath(output_path), os.fspath(input_path)],
+                # age writes nothing to stdout with -o; keep only stderr for errors
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=True,
+            )
+            return output_path
+        except subprocess.CalledProcessError as e:
+            raise VaultCryptoError(f"Encryption failed: {e.stderr.decode()}")
+
+    def encrypt_bytes(self, plaintext: bytes, recipient: Optional[str] = None) -> bytes:
+        """
+        Encrypt bytes in memory and return the ciphertext, without touching disk.
+
+        Args:
+            plaintext: Data to encrypt
+            recipient: Public key to encrypt to (default: self)
+
+        Returns:
+            Encrypted bytes (binary age format)
+        """
+        self._check_backend()
+
+        pub_key = recipient or self.get_public_key()
+
+        if PYRAGE_AVAILABLE:
+            try:
+                return pyrage.encrypt(plaintext, [pyrage.x25519.Recipient.from_str(pub_key)])
+            except Exception as e:
+                raise VaultCryptoError(f"Encryption failed: {e}")
+
+        try:
+            # run() feeds stdin and drains stdout/stderr concurrently, so large
+            # payloads cannot deadlock on a full pipe buffer
+            result = subprocess.run(
+                ["age", "-r", pub_key],
+                input=plaintext,
                 capture_output=True,
                 check=True,
             )
+            return result.stdout
+        except subprocess.CalledProcessError as e:
+            raise VaultCryptoError(f"Encryption failed: {e.stderr.decode()}")
+
+    def encrypt_bytes_to_file(
+        self, plaintext: bytes, ciphertext_path: Union[str, Path], recipient: Optional[str] = None
+    ) -> Path:
+        """
+        Encrypt bytes in memory straight into a ciphertext file.
+
+        The plaintext is piped to age on stdin, so re-encrypting data that
+        is already in memory never writes it to disk.
+
+        Args:
+            plaintext: Data to encrypt
+            ciphertext_path: Output file
+            recipient: Public key to encrypt to (default: self)
+
+        Returns:
+            Path to encrypted file
+        """
+        self._check_backend()
+
+        output_path = _as_path(ciphertext_path)
+        pub_key = recipient or self.get_public_key()
+
+        if PYRAGE_AVAILABLE:
+            output_path.write_bytes(self.encrypt_bytes(plaintext, pub_key))
+            return output_path
+
+        try:
+            subprocess.run(
+                ["age", "-r", pub_key, "-o", os.fspath(output_path)],
+                input=plaintext,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=True,
+            )
             return output_path
         except subprocess.CalledProcessError as e:
             raise VaultCryptoError(f"Encryption failed: {e.stderr.decode()}")
 
+    def encrypt_large(
+        self,
+        plaintext_path: Union[str, Path],
+        ciphertext_path: Optional[Union[str, Path]] = None,
+        recipient: Optional[str] = None,
+    ) -> Path:
+        """
+        Encrypt a large file, sealing its 64 KiB age chunks on all CPUs.
+
+        The output is a standard age file. Files under 1 MiB, or systems
+        without the `cryptography` package, go through encrypt() instead.
+
+        Args:
+            plaintext_path: File to encrypt
+            ciphertext_path: Output file (default: input + ".age")
+            recipient: Public key to encrypt to (default: self)
+
+        Returns:
+            Path to encrypted file
+        """
+        from . import age_stream
+
+        input_path = _as_path(plaintext_path)
+        if (
+            not age_stream.CRYPTOGRAPHY_AVAILABLE
+            or not input_path.is_file()
+            or input_path.stat().st_size < age_stream.PARALLEL_MIN_SIZE
+        ):
+            return self.encrypt(plaintext_path, ciphertext_path, recipient)
+
+        if ciphertext_path is None:
+            output_path = input_path.with_name(input_path.name + ".age")
+        else:
+            output_path = _as_path(ciphertext_path)
+
+        try:
+            age_stream.encrypt_file(input_path, output_path, recipient or self.get_public_key())
+        except ValueError as e:
+            raise VaultCryptoError(f"Encryption failed: {e}")
+        return output_path
+
+    def encrypt_many(
+        self,
+        plaintext_paths: Iterable[Union[str, Path]],
+        recipient: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Path]:
+        """
+        Encrypt several files, each to its own input + ".age" output.
+
+        With the age CLI the per-file processes run concurrently on a thread
+        pool, so their startup cost overlaps instead of adding up. pyrage
+        encrypts in-process and needs no pool.
+
+        Args:
+            plaintext_paths: Files to encrypt
+            recipient: Public key to encrypt to (default: self)
+            max_workers: Concurrent age processes (default: one per CPU, as age is CPU-bound)
+
+        Returns:
+            Paths to the encrypted files, in input order
+        """
+        self._check_backend()
+
+        paths = list(plaintext_paths)
+        pub_key = recipient or self.get_public_key()
+        if PYRAGE_AVAILABLE or len(paths) < 2:
+            return [self.encrypt(path, recipient=pub_key) for path in paths]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            return list(pool.map(lambda path: self.encrypt(path, recipient=pub_key), paths))
+
     def decrypt(
         self, ciphertext_path: Union[str, Path], plaintext_path: Optional[Union[str, Path]] = None
     ) -> Path:
@@ -408,90 +1092,387 @@ class Vault:
         Returns:
             Path to decrypted file
         """
-        self._check_age_installed()
+        self._check_backend()
 
-        input_path = Path(ciphertext_path).expanduser()
+        input_path = _as_path(ciphertext_path)
         if not input_path.exists():
             raise VaultCryptoError(f"Encrypted file not found: {input_path}")
 
-        using_ram_temp = False
-
+        temp_dir = None
+        created = plaintext_path is None
         if plaintext_path is None:
-            # Create secure temp file in RAM if possible
+            # Create secure temp file in RAM if possible, else in the system
+            # temp dir; mkstemp creates it 0600 with O_EXCL
             temp_dir = get_secure_temp_dir()
-            if temp_dir:
-                # Use RAM-backed temp directory
-                fd, output_path = tempfile.mkstemp(
-                    prefix="nakimi-secrets-", suffix=".json", dir=str(temp_dir)
-                )
-                os.close(fd)
-                output_path = Path(output_path)
-                using_ram_temp = True
-            else:
-                # Fallback to system temp
-                fd, output_path = tempfile.mkstemp(prefix="nakimi-secrets-", suffix=".json")
-                os.close(fd)
-                output_path = Path(output_path)
+            fd, output_path = tempfile.mkstemp(
+                prefix="nakimi-secrets-", suffix=".json", dir=str(temp_dir) if temp_dir else None
+            )
+            os.close(fd)
+            output_path = Path(output_path)
         else:
-            output_path = Path(plaintext_path).expanduser()
+            output_path = _as_path(plaintext_path)
+            try:
+                created = _create_private_file(output_path)
+            except OSError as e:
+                raise VaultCryptoError(f"Cannot create output file {output_path}: {e}")
 
         try:
-            with self._with_decrypted_key() as key_path:
-                subprocess.run(
-                    ["age", "-d", "-i", str(key_path), "-o", str(output_path), str(input_path)],
-                    capture_output=True,
-                    check=True,
-                )
-            # Secure the temp file
-            os.chmod(output_path, 0o600)
+            if PYRAGE_AVAILABLE:
+                self._decrypt_file_in_process(input_path, output_path)
+            else:
+                self._decrypt_file_with_age(input_path, output_path)
 
             # Try to lock in memory to prevent swapping (best effort)
-            if using_ram_temp and can_mlock():
-                # We have a RAM-based file and can mlock - try to prevent swap
-                if not mlock_file(output_path):
-                    # mlock failed, but we still have RAM storage
-                    pass  # Silent - this is an optimization
+            if temp_dir and can_mlock():
+                # We have a RAM-based file and can mlock - try to prevent swap.
+                # A failure is silent: we still have RAM storage
+                mlock_file(output_path)
 
             return output_path
-        except subprocess.CalledProcessError as e:
-            # Clean up temp file on failure
-            if plaintext_path is None and output_path.exists():
+        except VaultCryptoError:
+            # Clean up the output file on failure, if it was ours
+            if created and output_path.exists():
                 output_path.unlink()
+            raise
+
+    def decrypt_large(
+        self,
+        ciphertext_path: Union[str, Path],
+        plaintext_path: Union[str, Path],
+    ) -> Path:
+        """
+        Decrypt a large age file, opening its chunks on all CPUs.
+
+        Mirrors encrypt_large(): small files, or systems without the
+        `cryptography` package, go through decrypt() instead.
+
+        Args:
+            ciphertext_path: File to decrypt (.age file)
+            plaintext_path: Output file
+
+        Returns:
+            Path to decrypted file
+        """
+        from . import age_stream
+
+        input_path = _as_path(ciphertext_path)
+        if (
+            not age_stream.CRYPTOGRAPHY_AVAILABLE
+            or not input_path.is_file()
+            or input_path.stat().st_size < age_stream.PARALLEL_MIN_SIZE
+        ):
+            return self.decrypt(ciphertext_path, plaintext_path)
+
+        output_path = _as_path(plaintext_path)
+        try:
+            created = _create_private_file(output_path)
+        except OSError as e:
+            raise VaultCryptoError(f"Cannot create output file {output_path}: {e}")
+
+        try:
+            age_stream.decrypt_file(input_path, output_path, self._read_secret_key())
+        except ValueError as e:
+            # Never leave a partially decrypted file behind, but only remove one we created
+            if created and output_path.exists():
+                secure_delete(output_path)
+            raise VaultCryptoError(f"Decryption failed: {e}")
+        return output_path
+
+    def _decrypt_file_with_age(self, input_path: Path, output_path: Path):
+        """Decrypt input_path to output_path with the age CLI."""
+        try:
+            with self._with_decrypted_key() as key_path:
+                subprocess.run(
+                    [
+                        "age",
+                        "-d",
+                        "-i",
+                        os.fspath(key_path),
+                        "-o",
+                        os.fspath(output_path),
+                        os.fspath(input_path),
+                    ],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    check=True,
+                )
+        except subprocess.CalledProcessError as e:
             raise VaultCryptoError(f"Decryption failed: {e.stderr.decode()}")
 
+    def _decrypt_file_in_process(self, input_path: Path, output_path: Path):
+        """Decrypt input_path to output_path with pyrage."""
+        identity = self._get_identity()
+        try:
+            pyrage.decrypt_file(os.fspath(input_path), os.fspath(output_path), [identity])
+        except Exception as e:
+            raise VaultCryptoError(f"Decryption failed: {e}")
+
     def decrypt_to_string(self, ciphertext_path: Union[str, Path]) -> str:
         """
         Decrypt a file and return contents as string.
 
         Warning: Be careful - secrets will be in memory.
         """
-        self._check_age_installed()
+        return self.decrypt_to_bytes(ciphertext_path).decode("utf-8")
+
+    def decrypt_to_bytes(self, ciphertext_path: Union[str, Path]) -> bytes:
+        """
+        Decrypt a file and return contents as bytes, without touching disk.
+
+        With the decrypt_cache_ttl setting (NAKIMI_DECRYPT_CACHE_TTL) above 0,
+        results are cached in-process for that many seconds, keyed on the
+        ciphertext and key file paths and mtimes, so repeat reads of an
+        unchanged vault skip the decryption. The cache is off by default: while
+        an entry lives, the plaintext stays in memory and a YubiKey-protected
+        vault is read again without a touch or PIN. Vault.clear_cache() wipes it.
+
+        Warning: Be careful - secrets will be in memory.
+        """
+        self._check_backend()
+
+        input_path = _as_path(ciphertext_path)
+        ttl = self.config.decrypt_cache_ttl
+        if not ttl:
+            return self._decrypt_to_bytes_uncached(input_path)
+        try:
+            cache_key = (
+                os.fspath(input_path),
+                input_path.stat().st_mtime_ns,
+                self._key_file_str,
+                self.key_file.stat().st_mtime_ns,
+            )
+        except OSError:
+            cache_key = None
+        else:
+            cached = _decrypt_cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        plaintext = self._decrypt_to_bytes_uncached(input_path)
+        if cache_key is not None:
+            _decrypt_cache_put(cache_key, plaintext, ttl)
+        return plaintext
 
-        input_path = Path(ciphertext_path).expanduser()
+    def _decrypt_to_bytes_uncached(self, input_path: Path) -> bytes:
+        """decrypt_to_bytes without the cache"""
         if not input_path.exists():
             raise VaultCryptoError(f"Encrypted file not found: {input_path}")
 
+        if PYRAGE_AVAILABLE:
+            identity = self._get_identity()
+            try:
+                return pyrage.decrypt(input_path.read_bytes(), [identity])
+            except Exception as e:
+                raise VaultCryptoError(f"Decryption failed: {e}")
+
+        if self._session_key is not None:
+            # Inside decrypt_session(), so cryptography is importable and the key is loaded
+            from . import age_stream
+
+            try:
+                return b"".join(age_stream.iter_decrypt(input_path, self._session_key))
+            except ValueError as e:
+                raise VaultCryptoError(f"Decryption failed: {e}")
+
         try:
             with self._with_decrypted_key() as key_path:
-                result = subprocess.run(
-                    ["age", "-d", "-i", str(key_path), str(input_path)],
-                    capture_output=True,
-                    check=True,
-                )
-            return result.stdout.decode("utf-8")
+                args = ["age", "-d", "-i", os.fspath(key_path), os.fspath(input_path)]
+                return _run_to_memory(args)
         except subprocess.CalledProcessError as e:
             raise VaultCryptoError(f"Decryption failed: {e.stderr.decode()}")
 
+    @staticmethod
+    def clear_cache():
+        """Zero and drop every cached decrypt_to_bytes() result"""
+        with _decrypt_cache_lock:
+            for entry in _decrypt_cache.values():
+                _drop_cache_entry(entry)
+            _decrypt_cache.clear()
+
+    def iter_decrypt(
+        self,
+        ciphertext_path: Union[str, Path],
+        chunk_size: int = 65536,
+    ) -> Iterator[bytes]:
+        """
+        Decrypt a file and yield the plaintext in chunk_size chunks as it is produced.
+
+        Memory use stays around one chunk instead of the whole file: age's
+        stdout is read chunk_size bytes at a time. Inside decrypt_session()
+        the file is decrypted in-process instead, like decrypt_to_bytes().
+        pyrage has no streaming API, so with pyrage the whole plaintext is
+        decrypted into one buffer before it is yielded.
+
+        Raises:
+            VaultCryptoError: On the first next() if the file is missing, or
+                whenever decryption fails (possibly after earlier chunks)
+        """
+        input_path = _as_path(ciphertext_path)
+        if not input_path.exists():
+            raise VaultCryptoError(f"Encrypted file not found: {input_path}")
+
+        if PYRAGE_AVAILABLE:
+            data = self.decrypt_to_bytes(input_path)
+            for start in range(0, len(data), chunk_size):
+                yield data[start : start + chunk_size]
+        elif self._session_key is not None:
+            # Inside decrypt_session(), so cryptography is importable and the key is loaded
+            from . import age_stream
+
+            try:
+                blocks = age_stream.iter_decrypt(input_path, self._session_key)
+                yield from _rechunk(blocks, chunk_size)
+            except ValueError as e:
+                raise VaultCryptoError(f"Decryption failed: {e}")
+        else:
+            self._check_age_installed()
+            yield from self._iter_decrypt_with_age(input_path, chunk_size)
+
+    def _iter_decrypt_with_age(self, input_path: Path, chunk_size: int) -> Iterator[bytes]:
+        """Stream age's stdout; the decrypted key stays available until age exits"""
+        with self._with_decrypted_key() as key_path:
+            proc = subprocess.Popen(
+                ["age", "-d", "-i", os.fspath(key_path), os.fspath(input_path)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0,
+            )
+            try:
+                for block in iter(lambda: proc.stdout.read(chunk_size), b""):
+                    yield block
+                # age only writes a few lines to stderr, so reading it last cannot block
+                stderr = proc.stderr.read()
+                if proc.wait() != 0:
+                    raise VaultCryptoError(f"Decryption failed: {stderr.decode()}")
+            finally:
+                # Consumer stopped early (or an error occurred): don't leave age running
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+                proc.stderr.close()
+
+
+def _rechunk(blocks: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Regroup a stream of byte blocks into size-byte chunks (the last may be shorter)"""
+    pending = bytearray()
+    try:
+        for block in blocks:
+            pending += block
+            while len(pending) >= size:
+                yield bytes(pending[:size])
+                del pending[:size]
+        if pending:
+            yield bytes(pending)
+    finally:
+        _wipe(pending)
+
+
+_RAM_FILESYSTEMS = frozenset({"tmpfs", "ramfs"})
+
+
+@functools.lru_cache(maxsize=1)
+def _mount_table() -> tuple:
+    """
+    Parse /proc/self/mountinfo into (mount point, fs type) pairs, longest first.
+
+    Returns an empty tuple where mountinfo is unavailable (non-Linux).
+    """
+    try:
+        with open("/proc/self/mountinfo") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return ()
+
+    mounts = []
+    # Later entries are mounted over earlier ones at the same point, so they
+    # must win the (stable) longest-first sort below
+    for line in reversed(lines):
+        # <id> <parent> <maj:min> <root> <mount point> <options> [optional...] - <fstype> ...
+        fields, sep, tail = line.partition(" - ")
+        fields = fields.split()
+        if not sep or len(fields) < 5 or not tail:
+            continue
+        # Mount points escape spaces and friends as octal, e.g. \040
+        mount_point = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[4])
+        mounts.append((mount_point, tail.split()[0]))
+    mounts.sort(key=lambda mount: len(mount[0]), reverse=True)
+    return tuple(mounts)
+
 
 def is_ram_disk(path: Union[str, Path]) -> bool:
     """Check if path is on a RAM-backed filesystem (tmpfs)"""
+    mounts = _mount_table()
+    if mounts:
+        real_path = os.path.realpath(path)
+        for mount_point, fs_type in mounts:
+            if real_path == mount_point or real_path.startswith(mount_point.rstrip("/") + "/"):
+                return fs_type in _RAM_FILESYSTEMS
+        return False
+
     try:
-        result = subprocess.run(["df", "-T", str(path)], capture_output=True, text=True, check=True)
+        result = subprocess.run(
+            ["df", "-T", os.fspath(path)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
         return "tmpfs" in result.stdout
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
 
+def _is_rotational(path: Path) -> bool:
+    """
+    Check whether path lives on a spinning disk, via Linux sysfs.
+
+    Returns True when it cannot be determined, so callers err on the
+    side of overwriting.
+    """
+    try:
+        return _device_is_rotational(path.stat().st_dev)
+    except OSError:
+        return True
+
+
+@functools.lru_cache(maxsize=16)
+def _device_is_rotational(st_dev: int) -> bool:
+    """sysfs lookup behind _is_rotational, cached per device"""
+    try:
+        dev_dir = Path(os.path.realpath(f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}"))
+        # Partitions have no queue/ of their own; their parent disk does
+        for candidate in (dev_dir, dev_dir.parent):
+            rotational = candidate / "queue" / "rotational"
+            if rotational.exists():
+                return rotational.read_text().strip() != "0"
+    except (OSError, ValueError):
+        pass
+    return True
+
+
+# Random fill for _overwrite_file. The overwrite only has to replace the old
+# contents, not be fresh per call, so one block is drawn and reused.
+_RANDOM_BLOCK = os.urandom(1 << 16)
+
+
+def _overwrite_file(path: Path, chunk_size: int = len(_RANDOM_BLOCK)):
+    """Overwrite a file's contents once with random data and flush it to disk (best effort)"""
+    try:
+        fd = os.open(path, os.O_WRONLY)
+    except OSError:
+        return
+    try:
+        size = os.fstat(fd).st_size
+        block = memoryview(_RANDOM_BLOCK)[:chunk_size]
+        for offset in range(0, size, len(block)):
+            os.pwrite(fd, block[: size - offset], offset)
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def secure_delete(file_path: Union[str, Path]):
     """
     Securely delete a file.
@@ -499,12 +1480,18 @@ def secure_delete(file_path: Union[str, Path]):
     If the file is on a RAM disk (tmpfs), regular delete is sufficient
     since the data was never on physical disk.
 
-    Otherwise, use shred to overwrite before deleting (best effort on SSDs).
+    On SSDs, wear leveling remaps writes so overwriting in place does not
+    reach the old blocks; a regular delete is all that helps there too.
+
+    Otherwise, overwrite the contents once with random data before deleting.
     """
-    path = Path(file_path).expanduser()
+    path = _as_path(file_path)
     if not path.exists():
         return
 
+    # Drop any mlock_file() mapping, which would otherwise keep the pages alive
+    munlock_file(path)
+
     # Check if on RAM disk
     if is_ram_disk(path):
         # On RAM disk - regular delete is sufficient
@@ -512,9 +1499,7 @@ def secure_delete(file_path: Union[str, Path]):
         path.unlink()
         return
 
-    # On physical storage - try shred first
-    try:
-        subprocess.run(["shred", "-u", str(path)], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Fall back to regular delete
-        path.unlink()
+    # On spinning disk - overwrite in place first
+    if _is_rotational(path):
+        _overwrite_file(path)
+    path.unlink()
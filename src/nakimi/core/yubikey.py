@@ -21,6 +21,7 @@ Usage:
 
 import logging
 import os
+import shutil
 import subprocess
 from typing import Optional
 
@@ -28,6 +29,14 @@ from .config import VaultConfig
 
 logger = logging.getLogger(__name__)
 
+# Tool presence is system-wide, so a successful probe is shared by every
+# manager in the process. Failures are not cached here: a long-running
+# process (the MCP server) picks up a tool installed after it started.
+_ykman_installed = False
+_age_plugin_installed = False
+
+_AGE_PLUGIN_URL = "https://github.com/str4d/age-plugin-yubikey"
+
 
 class YubiKeyError(Exception):
     """Raised when YubiKey operations fail."""
@@ -42,15 +51,23 @@ class YubiKeyManager:
         self.config = config
         self._ykman_available: Optional[bool] = None
         self._yubikey_present: Optional[bool] = None
+        # Slot recipient and identity, fetched once and dropped when age fails
+        # with them (e.g. the YubiKey was swapped)
+        self._recipient: Optional[str] = None
+        self._identity: Optional[str] = None
 
     def _check_ykman_installed(self) -> bool:
         """Check if ykman CLI is available."""
+        global _ykman_installed
         if self._ykman_available is not None:
             return self._ykman_available
+        if _ykman_installed:
+            self._ykman_available = True
+            return True
 
         try:
             subprocess.run(["ykman", "--version"], capture_output=True, check=True)
-            self._ykman_available = True
+            self._ykman_available = _ykman_installed = True
             logger.debug("ykman CLI detected")
             return True
         except (subprocess.CalledProcessError, FileNotFoundError):
@@ -60,28 +77,77 @@ class YubiKeyManager:
 
     def _check_yubikey_present(self) -> bool:
         """Check if a YubiKey is present and accessible."""
-        if self._yubikey_present is not None:
-            return self._yubikey_present
+        if self._yubikey_present is None:
+            self._probe_once()
+        return self._yubikey_present
 
-        if not self._check_ykman_installed():
-            self._yubikey_present = False
-            return False
+    def _probe_once(self):
+        """
+        Probe for ykman, a YubiKey and age-plugin-yubikey in one round.
 
+        `ykman info` and `age-plugin-yubikey --identity` are started side by
+        side before either is waited on, and their outcomes seed the presence
+        caches and the slot identity, so unlocking a YubiKey-protected vault
+        costs two parallel process spawns instead of four serial ones.
+        """
+        global _ykman_installed, _age_plugin_installed
+        commands = (
+            ("ykman", ["ykman", "info"]),
+            ("plugin", ["age-plugin-yubikey", "--identity", "--slot", self.config.yubikey_slot]),
+        )
+        procs = {}
+        spawned = False
         try:
-            result = subprocess.run(["ykman", "info"], capture_output=True, text=True, check=True)
-            # If command succeeds, YubiKey is present
-            self._yubikey_present = True
-            logger.debug("YubiKey detected: %s", result.stdout[:100])
-            return True
-        except subprocess.CalledProcessError as e:
-            logger.debug("YubiKey detection failed: %s", e.stderr)
-            self._yubikey_present = False
-            return False
+            for name, cmd in commands:
+                try:
+                    procs[name] = subprocess.Popen(
+                        cmd,
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                    )
+                except FileNotFoundError:
+                    procs[name] = None
+            spawned = True
+        finally:
+            # Any other spawn failure (EACCES, EMFILE...) propagates; reap what did start
+            if not spawned:
+                for proc in procs.values():
+                    if proc is not None:
+                        proc.kill()
+                        proc.communicate()
+
+        ykman = procs["ykman"]
+        self._ykman_available = ykman is not None
+        self._yubikey_present = False
+        if ykman is not None:
+            _ykman_installed = True
+            stdout, stderr = ykman.communicate()
+            self._yubikey_present = ykman.returncode == 0
+            if self._yubikey_present:
+                logger.debug("YubiKey detected: %s", stdout[:100])
+            else:
+                logger.debug("YubiKey detection failed: %s", stderr)
+        else:
+            logger.debug("ykman CLI not found")
+
+        plugin = procs["plugin"]
+        if plugin is not None:
+            _age_plugin_installed = True
+            stdout, _ = plugin.communicate()
+            if plugin.returncode == 0 and stdout.strip():
+                self._identity = stdout.strip()
 
     def _check_age_plugin_installed(self) -> bool:
         """Check if age-plugin-yubikey is available."""
+        global _age_plugin_installed
+        if _age_plugin_installed:
+            return True
+
         try:
             subprocess.run(["age-plugin-yubikey", "--version"], capture_output=True, check=True)
+            _age_plugin_installed = True
             return True
         except (subprocess.CalledProcessError, FileNotFoundError):
             return False
@@ -90,8 +156,11 @@ class YubiKeyManager:
         """
         Get age recipient string for the configured YubiKey slot.
 
-        Runs: age-plugin-yubikey --list --slot <slot>
+        Runs: age-plugin-yubikey --list --slot <slot> (once; the result is cached)
         """
+        if self._recipient is not None:
+            return self._recipient
+
         slot = self.config.yubikey_slot
         try:
             result = subprocess.run(
@@ -103,12 +172,11 @@ class YubiKeyManager:
             # Parse output: recipient line starts with age1yubikey1...
             for line in result.stdout.split("\n"):
                 if line.startswith("age1yubikey1"):
-                    return line.strip()
+                    self._recipient = line.strip()
+                    return self._recipient
             raise YubiKeyError("No recipient found in age-plugin-yubikey output")
         except FileNotFoundError:
-            raise YubiKeyError(
-                "age-plugin-yubikey not found. " "Install it from https://github.com/str4d/age-plugin-yubikey"
-            )
+            raise YubiKeyError(f"age-plugin-yubikey not found. Install it from {_AGE_PLUGIN_URL}")
         except subprocess.CalledProcessError as e:
             raise YubiKeyError(f"Failed to get recipient: {e.stderr}")
 
@@ -116,9 +184,13 @@ class YubiKeyManager:
         """
         Get age identity for the configured YubiKey slot.
 
-        Runs: age-plugin-yubikey --identity --slot <slot>
+        Runs: age-plugin-yubikey --identity --slot <slot>, unless the
+        availability probe already fetched it.
         Returns identity as string.
         """
+        if self._identity is not None:
+            return self._identity
+
         slot = self.config.yubikey_slot
         try:
             result = subprocess.run(
@@ -127,11 +199,10 @@ class YubiKeyManager:
                 text=True,
                 check=True,
             )
-            return result.stdout.strip()
+            self._identity = result.stdout.strip()
+            return self._identity
         except FileNotFoundError:
-            raise YubiKeyError(
-                "age-plugin-yubikey not found. " "Install it from https://github.com/str4d/age-plugin-yubikey"
-            )
+            raise YubiKeyError(f"age-plugin-yubikey not found. Install it from {_AGE_PLUGIN_URL}")
         except subprocess.CalledProcessError as e:
             raise YubiKeyError(f"Failed to get identity: {e.stderr}")
 
@@ -147,9 +218,7 @@ class YubiKeyManager:
         if not self.config.yubikey_enabled:
             return False
 
-        if not self._check_ykman_installed():
-            return False
-
+        # A missing ykman is answered by the presence probe itself
         return self._check_yubikey_present()
 
     def get_diagnostics(self) -> dict:
@@ -196,6 +265,42 @@ class YubiKeyManager:
 
         return diagnostics
 
+    def status_bundle(self) -> dict:
+        """
+        Collect everything `nakimi yubikey status` reports with a single `ykman info`.
+
+        A missing ykman binary and a missing YubiKey are both answered by that
+        one call, and the results seed the presence caches so that the slot
+        lookup does not probe again.
+
+        Returns:
+            Dictionary with ykman_installed, yubikey_present, age_plugin_installed,
+            slot_info (dict or None) and slot_error (str or None)
+        """
+        try:
+            result = subprocess.run(["ykman", "info"], capture_output=True, text=True, check=True)
+            self._ykman_available = self._yubikey_present = True
+            logger.debug("YubiKey detected: %s", result.stdout[:100])
+        except FileNotFoundError:
+            self._ykman_available = self._yubikey_present = False
+        except subprocess.CalledProcessError as e:
+            logger.debug("YubiKey detection failed: %s", e.stderr)
+            self._ykman_available, self._yubikey_present = True, False
+
+        bundle = {
+            "ykman_installed": self._ykman_available,
+            "yubikey_present": self._yubikey_present,
+            "age_plugin_installed": shutil.which("age-plugin-yubikey") is not None,
+            "slot_info": None,
+            "slot_error": None,
+        }
+        if self._yubikey_present:
+            try:
+                bundle["slot_info"] = self.get_slot_info()
+            except YubiKeyError as e:
+                bundle["slot_error"] = str(e)
+        return bundle
+
     def get_slot_info(self) -> dict:
         """
         Get information about the configured PIV slot.
@@ -276,6 +381,7 @@ class YubiKeyManager:
             )
             return result.stdout
         except subprocess.CalledProcessError as e:
+            self._recipient = None
             raise YubiKeyError(f"Age encryption failed: {e.stderr.decode()}")
 
     def decrypt_age_key(self, encrypted_key: bytes) -> str:
@@ -317,6 +423,7 @@ class YubiKeyManager:
             )
             return result.stdout.decode("utf-8")
         except subprocess.CalledProcessError as e:
+            self._identity = None
             raise YubiKeyError(f"Age decryption failed: {e.stderr.decode()}")
         finally:
             # Clean up temporary file
@@ -7,20 +7,94 @@ and provides methods for common email operations.
 
 import sys
 import base64
-from datetime import datetime
-from email.mime.text import MIMEText
-from typing import Optional, List, Dict, Any
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple
 
-# Google libraries
-try:
+if TYPE_CHECKING:
     from google.oauth2.credentials import Credentials
     from google.auth.transport.requests import Request
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
 
-    GOOGLE_LIBS_AVAILABLE = True
-except ImportError:
-    GOOGLE_LIBS_AVAILABLE = False
+# Google libraries are heavy, so they are imported into this module's
+# globals on first GmailClient construction rather than at import time
+_GOOGLE_IMPORTS = {
+    "Credentials": "google.oauth2.credentials",
+    "Request": "google.auth.transport.requests",
+    "build": "googleapiclient.discovery",
+    "HttpError": "googleapiclient.errors",
+}
+
+
+def _import_google_libs() -> bool:
+    """Import the Google API libraries on first use; return whether they are available"""
+    module_globals = globals()
+    try:
+        for name, module in _GOOGLE_IMPORTS.items():
+            if name not in module_globals:
+                module_globals[name] = getattr(importlib.import_module(module), name)
+    except ImportError:
+        return False
+    return True
+
+
+def __getattr__(name: str):
+    if name == "GOOGLE_LIBS_AVAILABLE":
+        return _import_google_libs()
+    if name in _GOOGLE_IMPORTS and _import_google_libs():
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Headers shown in message summaries; the set is used to skip everything else
+_SUMMARY_HEADERS = ["Subject", "From", "Date"]
+_WANTED_HEADERS = frozenset(_SUMMARY_HEADERS)
+# Partial-response mask so the API only serializes what a summary uses
+_SUMMARY_FIELDS = "id,snippet,payload/headers"
+
+# Refresh access tokens this many seconds before they expire
+_EXPIRY_MARGIN = 300
+
+# Authenticated clients keyed on (client_id, refresh_token); see GmailClient.get()
+_client_cache: Dict[Tuple[str, str], "GmailClient"] = {}
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching google-auth's expiry"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _is_plain_header(value: str) -> bool:
+    """True if value can go into a header verbatim (ASCII, one line, no folding needed)"""
+    return value.isascii() and "\r" not in value and "\n" not in value and len(value) < 900
+
+
+def _encode_message(to: str, subject: str, body: str) -> str:
+    """Build a text/plain email and return it base64url-encoded for the Gmail API"""
+    # 8bit bodies are limited to 998 octets per line (RFC 5322)
+    short_lines = all(len(line) < 998 for line in body.splitlines())
+    if _is_plain_header(to) and _is_plain_header(subject) and short_lines:
+        raw = (
+            f"To: {to}\r\n"
+            f"Subject: {subject}\r\n"
+            "MIME-Version: 1.0\r\n"
+            'Content-Type: text/plain; charset="utf-8"\r\n'
+            "Content-Transfer-Encoding: 8bit\r\n"
+            "\r\n"
+            f"{body}"
+        ).encode("utf-8")
+    else:
+        # Non-ASCII or multi-line headers and overlong lines need MIME encoding
+        from email.mime.text import MIMEText
+
+        message = MIMEText(body)
+        message["to"] = to
+        message["subject"] = subject
+        raw = message.as_bytes()
+    return base64.urlsafe_b64encode(raw).decode("ascii")
 
 
 class GmailAuthError(Exception):
@@ -46,7 +120,7 @@ class GmailClient:
         Args:
             secrets: Dictionary with keys: client_id, client_secret, refresh_token
         """
-        if not GOOGLE_LIBS_AVAILABLE:
+        if not _import_google_libs():
             raise ImportError(
                 "Google API libraries not installed. "
                 "Run: pip install google-auth google-auth-oauthlib "
@@ -54,13 +128,33 @@ class GmailClient:
             )
 
         self.secrets = secrets
-        self.creds: Optional[Credentials] = None
+        self.creds: Optional["Credentials"] = None
         self.service = None
         self._auth_error: Optional[str] = None
+        # time.monotonic() deadline for the current access token
+        self._expiry_monotonic: Optional[float] = None
+        # Token-endpoint transport, created on first refresh; its requests.Session
+        # keeps the connection to oauth2.googleapis.com alive between refreshes
+        self._auth_request: Optional["Request"] = None
 
         self._validate_secrets()
         self._authenticate()
 
+    @classmethod
+    def get(cls, secrets: Dict[str, str]) -> "GmailClient":
+        """
+        Return a shared client for these credentials, creating it on first use.
+
+        The cached client keeps its credentials, discovery-built service and
+        HTTP connection, so later callers in the same process skip the OAuth
+        refresh and TLS handshake.
+        """
+        key = (secrets.get("client_id"), secrets.get("refresh_token"))
+        client = _client_cache.get(key)
+        if client is None:
+            client = _client_cache[key] = cls(secrets)
+        return client
+
     def _validate_secrets(self):
         """Validate required secrets are present"""
         required = ["client_id", "client_secret", "refresh_token"]
@@ -68,11 +162,48 @@ class GmailClient:
         if missing:
             raise GmailAuthError(f"Missing required Gmail secrets: {missing}")
 
+    def _cached_token(self) -> Optional[tuple]:
+        """Return (access_token, expiry) from secrets if it is valid for 5+ more minutes"""
+        token = self.secrets.get("access_token")
+        expiry = self.secrets.get("token_expiry")
+        if not token or not expiry:
+            return None
+        try:
+            expiry = datetime.fromisoformat(expiry)
+        except (TypeError, ValueError):
+            return None
+        if (expiry - _utcnow()).total_seconds() < _EXPIRY_MARGIN:
+            return None
+        return token, expiry
+
+    def _track_expiry(self):
+        """Convert the token's wall-clock expiry into a monotonic deadline"""
+        if self.creds.expiry:
+            expires_in = (self.creds.expiry - _utcnow()).total_seconds()
+            self._expiry_monotonic = time.monotonic() + expires_in
+        else:
+            self._expiry_monotonic = None
+
+    def _remember_token(self):
+        """Store the current access token in secrets so later clients can reuse it"""
+        self._track_expiry()
+        if self.creds.token and self.creds.expiry:
+            self.secrets["access_token"] = self.creds.token
+            self.secrets["token_expiry"] = self.creds.expiry.isoformat()
+
+    def _refresh_token(self):
+        """Refresh the access token, reusing one transport for every refresh"""
+        if self._auth_request is None:
+            self._auth_request = Request()
+        self.creds.refresh(self._auth_request)
+        self._remember_token()
+
     def _authenticate(self):
         """Authenticate using secrets"""
         try:
+            cached = self._cached_token()
             self.creds = Credentials(
-                token=None,
+                token=cached[0] if cached else None,
                 refresh_token=self.secrets["refresh_token"],
                 token_uri="https://oauth2.googleapis.com/token",
                 client_id=self.secrets["client_id"],
@@ -80,11 +211,17 @@ class GmailClient:
                 scopes=self.SCOPES,
             )
 
-            # Initial token refresh
-            self.creds.refresh(Request())
+            if cached:
+                # Reuse the access token from an earlier refresh
+                self.creds.expiry = cached[1]
+                self._track_expiry()
+            else:
+                # Initial token refresh
+                self._refresh_token()
 
-            # Build Gmail service
-            self.service = build("gmail", "v1", credentials=self.creds, static_discovery=False)
+            # Build Gmail service from the discovery document bundled with
+            # google-api-python-client (no HTTP fetch)
+            self.service = build("gmail", "v1", credentials=self.creds, static_discovery=True)
 
         except Exception as e:
             error_msg = str(e)
@@ -97,10 +234,9 @@ class GmailClient:
         if not self.creds:
             return
 
-        if self.creds.expiry:
-            expires_in = (self.creds.expiry - datetime.utcnow()).total_seconds()
-            if not self.creds.valid or expires_in < 300:
-                self.creds.refresh(Request())
+        expiry = self._expiry_monotonic
+        if expiry is not None and time.monotonic() > expiry - _EXPIRY_MARGIN:
+            self._refresh_token()
 
     def _execute_with_retry(self, api_call, *args, **kwargs):
         """Execute API call with automatic token refresh on 401"""
@@ -125,193 +261,129 @@ class GmailClient:
         print(f"❌ Gmail API Error: {error_details}", file=sys.stderr)
         return None
 
-    # === Public API Methods ===
-
-    def list_unread(self, max_results: int = 10) -> List[Dict[str, Any]]:
-        """List unread emails"""
-        try:
-            self._ensure_valid_token()
+    def _summarize_message(self, msg_id: str, msg_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the email summary dict from a metadata-format message"""
+        raw_headers = msg_data["payload"]["headers"]
+        headers = {h["name"]: h["value"] for h in raw_headers if h["name"] in _WANTED_HEADERS}
+        return {
+            "id": msg_id,
+            "subject": headers.get("Subject", "No Subject"),
+            "from": headers.get("From", "Unknown"),
+            "date": headers.get("Date", "Unknown"),
+            "snippet": msg_data.get("snippet", "")[:150],
+        }
+
+    def _fetch_message_metadata(self, msg_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one message's metadata on its own HTTP connection.
 
-            results = self._execute_with_retry(
-                self.service.users()
-                .messages()
-                .list(userId="me", q="is:unread", maxResults=max_results)
-                .execute
+        httplib2 connections are not thread-safe, so each call gets a
+        private AuthorizedHttp; this makes it safe to run from a thread pool.
+        """
+        import google_auth_httplib2
+        import httplib2
+
+        http = google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http())
+        return self._execute_with_retry(self._metadata_request(msg_id).execute, http=http)
+
+    def _metadata_request(self, msg_id: str):
+        """Build a messages.get request for just the fields a summary needs"""
+        return (
+            self.service.users()
+            .messages()
+            .get(
+                userId="me",
+                id=msg_id,
+                format="metadata",
+                metadataHeaders=_SUMMARY_HEADERS,
+                fields=_SUMMARY_FIELDS,
             )
+        )
 
-            if not results:
-                return []
-
-            messages = results.get("messages", [])
-            emails = []
-
-            for msg in messages:
-                msg_data = self._execute_with_retry(
-                    self.service.users()
-                    .messages()
-                    .get(
-                        userId="me",
-                        id=msg["id"],
-                        format="metadata",
-                        metadataHeaders=["Subject", "From", "Date"],
-                    )
-                    .execute
-                )
-
-                if msg_data:
-                    headers = {h["name"]: h["value"] for h in msg_data["payload"]["headers"]}
-                    emails.append(
-                        {
-                            "id": msg["id"],
-                            "subject": headers.get("Subject", "No Subject"),
-                            "from": headers.get("From", "Unknown"),
-                            "date": headers.get("Date", "Unknown"),
-                            "snippet": msg_data.get("snippet", "")[:150],
-                        }
-                    )
-
-            return emails
+    def _get_message_summaries(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch metadata for all messages, keeping list order.
 
-        except GmailAuthError:
-            return []
+        Uses one batch HTTP request; any messages the batch could not
+        return (rate limits, batch endpoint failure) are fetched
+        individually and concurrently.
+        """
+        if len(message_ids) == 1:
+            # A lone message needs no multipart batch envelope
+            msg_data = self._execute_with_retry(self._metadata_request(message_ids[0]).execute)
+            return [self._summarize_message(message_ids[0], msg_data)] if msg_data else []
 
-    def list_inbox(self, max_results: int = 10) -> List[Dict[str, Any]]:
-        """List emails in Inbox (has INBOX label)"""
-        try:
-            self._ensure_valid_token()
+        responses: Dict[str, Dict[str, Any]] = {}
 
-            results = self._execute_with_retry(
-                self.service.users()
-                .messages()
-                .list(userId="me", q="in:inbox", maxResults=max_results)
-                .execute
-            )
+        def collect(request_id, response, exception):
+            # Failed sub-requests are retried individually below
+            if exception is None and response:
+                responses[request_id] = response
 
-            if not results:
-                return []
-
-            messages = results.get("messages", [])
-            emails = []
-
-            for msg in messages:
-                msg_data = self._execute_with_retry(
-                    self.service.users()
-                    .messages()
-                    .get(
-                        userId="me",
-                        id=msg["id"],
-                        format="metadata",
-                        metadataHeaders=["Subject", "From", "Date"],
-                    )
-                    .execute
-                )
-
-                if msg_data:
-                    headers = {h["name"]: h["value"] for h in msg_data["payload"]["headers"]}
-                    emails.append(
-                        {
-                            "id": msg["id"],
-                            "subject": headers.get("Subject", "No Subject"),
-                            "from": headers.get("From", "Unknown"),
-                            "date": headers.get("Date", "Unknown"),
-                            "snippet": msg_data.get("snippet", "")[:150],
-                        }
-                    )
-
-            return emails
-
-        except GmailAuthError:
-            return []
+        batch = self.service.new_batch_http_request(callback=collect)
+        for msg_id in message_ids:
+            batch.add(self._metadata_request(msg_id), request_id=msg_id)
+        try:
+            batch.execute()
+        except Exception:
+            # Whole batch failed; everything falls through to individual fetches
+            pass
 
-    def list_recent(self, max_results: int = 10) -> List[Dict[str, Any]]:
-        """List most recent emails (read or unread)"""
+        missing = [msg_id for msg_id in message_ids if msg_id not in responses]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+                fetched = executor.map(self._fetch_message_metadata, missing)
+                for msg_id, msg_data in zip(missing, fetched):
+                    if msg_data:
+                        responses[msg_id] = msg_data
+
+        return [
+            self._summarize_message(msg_id, responses[msg_id])
+            for msg_id in message_ids
+            if msg_id in responses
+        ]
+
+    def _list_messages(self, max_results: int, query: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List messages (optionally matching a search query) with their metadata"""
         try:
             self._ensure_valid_token()
 
-            results = self._execute_with_retry(
-                self.service.users().messages().list(userId="me", maxResults=max_results).execute
-            )
+            list_kwargs = {"userId": "me", "maxResults": max_results, "fields": "messages/id"}
+            if query is not None:
+                list_kwargs["q"] = query
+
+            list_request = self.service.users().messages().list(**list_kwargs)
+            results = self._execute_with_retry(list_request.execute)
 
             if not results:
                 return []
 
             messages = results.get("messages", [])
-            emails = []
-
-            for msg in messages:
-                msg_data = self._execute_with_retry(
-                    self.service.users()
-                    .messages()
-                    .get(
-                        userId="me",
-                        id=msg["id"],
-                        format="metadata",
-                        metadataHeaders=["Subject", "From", "Date"],
-                    )
-                    .execute
-                )
-
-                if msg_data:
-                    headers = {h["name"]: h["value"] for h in msg_data["payload"]["headers"]}
-                    emails.append(
-                        {
-                            "id": msg["id"],
-                            "subject": headers.get("Subject", "No Subject"),
-                            "from": headers.get("From", "Unknown"),
-                            "date": headers.get("Date", "Unknown"),
-                            "snippet": msg_data.get("snippet", "")[:150],
-                        }
-                    )
-
-            return emails
+            if not messages:
+                return []
+
+            return self._get_message_summaries([msg["id"] for msg in messages])
 
         except GmailAuthError:
             return []
 
-    def search(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
-        """Search emails by query"""
-        try:
-            self._ensure_valid_token()
+    # === Public API Methods ===
 
-            results = self._execute_with_retry(
-                self.service.users().messages().list(userId="me", q=query, maxResults=max_results).execute
-            )
+    def list_unread(self, max_results: int = 10) -> List[Dict[str, Any]]:
+        """List unread emails"""
+        return self._list_messages(max_results, query="is:unread")
 
-            if not results:
-                return []
+    def list_inbox(self, max_results: int = 10) -> List[Dict[str, Any]]:
+        """List emails in Inbox (has INBOX label)"""
+        return self._list_messages(max_results, query="in:inbox")
 
-            messages = results.get("messages", [])
-            emails = []
-
-            for msg in messages:
-                msg_data = self._execute_with_retry(
-                    self.service.users()
-                    .messages()
-                    .get(
-                        userId="me",
-                        id=msg["id"],
-                        format="metadata",
-                        metadataHeaders=["Subject", "From", "Date"],
-                    )
-                    .execute
-                )
-
-                if msg_data:
-                    headers = {h["name"]: h["value"] for h in msg_data["payload"]["headers"]}
-                    emails.append(
-                        {
-                            "id": msg["id"],
-                            "subject": headers.get("Subject", "No Subject"),
-                            "from": headers.get("From", "Unknown"),
-                            "date": headers.get("Date", "Unknown"),
-                            "snippet": msg_data.get("snippet", "")[:150],
-                        }
-                    )
-
-            return emails
+    def list_recent(self, max_results: int = 10) -> List[Dict[str, Any]]:
+        """List most recent emails (read or unread)"""
+        return self._list_messages(max_results)
 
-        except GmailAuthError:
-            return []
+    def search(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Search emails by query"""
+        return self._list_messages(max_results, query=query)
 
     def list_labels(self) -> List[Dict[str, Any]]:
         """List Gmail labels"""
@@ -335,11 +407,7 @@ class GmailClient:
         try:
             self._ensure_valid_token()
 
-            message = MIMEText(body)
-            message["to"] = to
-            message["subject"] = subject
-
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
+            raw_message = _encode_message(to, subject, body)
             draft_body = {"message": {"raw": raw_message}}
 
             return self._execute_with_retry(
@@ -354,11 +422,7 @@ class GmailClient:
         try:
             self._ensure_valid_token()
 
-            message = MIMEText(body)
-            message["to"] = to
-            message["subject"] = subject
-
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
+            raw_message = _encode_message(to, subject, body)
             email_body = {"raw": raw_message}
 
             return self._execute_with_retry(
@@ -39,7 +39,7 @@ class GmailPlugin(Plugin):
         """Lazy-load Gmail client"""
         if self.client is None:
             try:
-                self.client = GmailClient(self.secrets)
+                self.client = GmailClient.get(self.secrets)
             except GmailAuthError as e:
                 raise PluginError(f"Failed to initialize Gmail: {e}")
         return self.client
@@ -3,6 +3,7 @@ Pytest fixtures for Nakimi tests.
 """
 
 import json
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -134,7 +135,8 @@ def mock_gmail_client():
 @pytest.fixture
 def patch_age_commands():
     """Patch age commands to avoid actual encryption in unit tests."""
-    with patch("subprocess.run") as mock_run:
+    # Force the age CLI backend even when pyrage is installed
+    with patch("subprocess.run") as mock_run, patch("nakimi.core.vault.PYRAGE_AVAILABLE", False):
         # Mock age-keygen
         def side_effect(cmd, *args, **kwargs):
             if "age-keygen" in cmd:
@@ -153,6 +155,9 @@ def patch_age_commands():
                 mock_result = Mock()
                 mock_result.returncode = 0
                 mock_result.stdout = b'{"gmail": {"client_id": "test"}}'
+                # decrypt_to_bytes hands age a memfd to write into
+                if isinstance(kwargs.get("stdout"), int) and kwargs["stdout"] >= 0:
+                    os.write(kwargs["stdout"], mock_result.stdout)
                 return mock_result
             else:
                 # Default mock
@@ -2,12 +2,25 @@
 Integration tests for CLI interface.
 """
 
+import json
+import os
 import sys
 from io import StringIO
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch, Mock
 
-from nakimi.cli.main import main
+import pytest
+
+from nakimi.cli.main import (
+    _build_parser,
+    _get_plugin_manager,
+    _parse_plugin_command,
+    cmd_plugins,
+    cmd_upgrade,
+    load_secrets,
+    main,
+)
 
 
 class TestCLIParsing:
@@ -21,11 +34,102 @@ class TestCLIParsing:
     # Note: parse_args is not exported from main.py
     # We'll test CLI parsing through actual execution tests
 
+    def test_parse_plugin_command(self):
+        """Test splitting plugin shortcut commands."""
+        assert _parse_plugin_command("gmail.unread") == ("gmail", "unread")
+        assert _parse_plugin_command("gmail.drafts.list") == ("gmail", "drafts.list")
+        assert _parse_plugin_command("init") is None
+        assert _parse_plugin_command("--config=a.b") is None
+
+    def test_build_parser_for_single_command(self):
+        """Test only the requested subparser is built for a known command."""
+        args = _build_parser("decrypt").parse_args(["decrypt", "secrets.age", "--keep"])
+        assert (args.cmd, args.file, args.keep) == ("decrypt", "secrets.age", True)
+
+        with pytest.raises(SystemExit):
+            _build_parser("decrypt").parse_args(["init"])
+        assert _build_parser(None).parse_args(["init"]).cmd == "init"
+
+    def test_upgrade_reports_installed_version(self, capsys):
+        """Test the new version comes from package metadata, not a second interpreter."""
+        args = SimpleNamespace(target_version=None)
+        with (
+            patch("subprocess.run", return_value=Mock(returncode=0)) as mock_run,
+            patch("importlib.metadata.version", return_value="9.9.9"),
+        ):
+            cmd_upgrade(args)
+
+        assert mock_run.call_count == 1
+        assert "New version: nakimi 9.9.9" in capsys.readouterr().out
+
+    @patch("sys.argv", ["nakimi", "--version"])
+    def test_version_skips_parser(self, capsys):
+        """Test --version is answered without building the argparse parser."""
+        with patch("nakimi.cli.main._build_parser") as mock_build, pytest.raises(SystemExit) as exc:
+            main()
+
+        assert exc.value.code == 0
+        mock_build.assert_not_called()
+        assert "nakimi" in capsys.readouterr().out
+
+
+class TestLoadSecrets:
+    """Test secrets loading."""
+
+    def test_load_secrets_not_cached(self, temp_dir):
+        """Test every load parses the file again, so no parsed copy outlives its caller."""
+        secrets_file = temp_dir / "secrets.json"
+        secrets_file.write_text(json.dumps({"gmail": {"token": "one"}}))
+
+        with patch.dict(os.environ, {"NAKIMI_SECRETS": str(secrets_file)}):
+            first = load_secrets()
+            assert load_secrets() is not first
+
+            secrets_file.write_text(json.dumps({"gmail": {"token": "two"}}))
+            second = load_secrets()
+
+        assert first == {"gmail": {"token": "one"}}
+        assert second == {"gmail": {"token": "two"}}
+
+    def test_plugin_manager_reused_for_same_secrets(self, mock_secrets):
+        """Test cmd_run reuses its PluginManager until the secrets change."""
+        first = _get_plugin_manager(mock_secrets, "gmail")
+        assert first.list_plugins() == ["gmail"]
+        assert _get_plugin_manager(mock_secrets, "gmail") is first
+        assert _get_plugin_manager(dict(mock_secrets), "gmail") is not first
+
+    def test_plugins_list_uses_session_index(self, temp_dir, capsys):
+        """Test `nakimi plugins` inside a session reads the parent's plugin index."""
+        secrets_file = temp_dir / "secrets.json"
+        index_file = temp_dir / "plugins.json"
+        index_file.write_text(
+            json.dumps(
+                {
+                    "secrets": str(secrets_file),
+                    "plugins": {"gmail": "Gmail"},
+                    "commands": ["gmail.unread"],
+                }
+            )
+        )
+        env = {"NAKIMI_SECRETS": str(secrets_file), "NAKIMI_PLUGIN_CACHE": str(index_file)}
+
+        with patch.dict(os.environ, env), patch("nakimi.cli.main.PluginManager") as mock_pm_class:
+            cmd_plugins(SimpleNamespace(command="list"))
+            cmd_plugins(SimpleNamespace(command="commands"))
+
+            mock_pm_class.assert_not_called()
+            assert "gmail" in capsys.readouterr().out
+
+            # An index for another secrets file is ignored
+            with patch.dict(os.environ, {"NAKIMI_SECRETS": str(temp_dir / "other.json")}):
+                cmd_plugins(SimpleNamespace(command="list"))
+            mock_pm_class.assert_called_once()
+
 
 class TestCLIExecution:
     """Test CLI command execution."""
 
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("sys.argv", ["nakimi", "init"])
     def test_cli_init(self, mock_vault_class):
         """Test init command execution."""
@@ -53,7 +157,7 @@ class TestCLIExecution:
         print("Mock generate_key calls:", mock_vault.generate_key.mock_calls)
         print("Output:", repr(output))
 
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("sys.argv", ["nakimi", "encrypt", "input.txt", "-o", "output.age"])
     @patch("pathlib.Path.exists")
     def test_cli_encrypt(self, mock_exists, mock_vault_class):
@@ -76,7 +180,7 @@ class TestCLIExecution:
         assert "Encrypted to: /path/to/output.age" in output
         mock_vault.encrypt.assert_called_once_with(Path("input.txt"), "output.age")
 
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("sys.argv", ["nakimi", "decrypt", "secrets.json.age", "-o", "output.json"])
     @patch("pathlib.Path.exists")
     def test_cli_decrypt(self, mock_exists, mock_vault_class):
@@ -100,12 +204,12 @@ class TestCLIExecution:
         mock_vault.decrypt.assert_called_once_with(Path("secrets.json.age"), "output.json")
 
     @patch("nakimi.cli.main.get_config", create=True)
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("nakimi.cli.main.PluginManager", create=True)
     @patch("sys.argv", ["nakimi", "plugins", "list"])
     @patch("pathlib.Path.exists")
-    @patch("nakimi.cli.main.secure_delete", create=True)
-    @patch("json.load")
+    @patch("nakimi.core.secure_delete")
+    @patch("nakimi.cli.main._json_loads")
     @patch("builtins.open")
     def test_cli_plugins_list(
         self,
@@ -158,15 +262,15 @@ class TestCLIExecution:
         assert "github" in output
 
         # Verify secrets were loaded
-        mock_vault.decrypt.assert_called_once_with(mock_config.secrets_file)
+        mock_vault.decrypt_to_bytes.assert_called_once_with(mock_config.secrets_file)
 
     @patch("nakimi.cli.main.get_config", create=True)
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("nakimi.cli.main.PluginManager", create=True)
     @patch("sys.argv", ["nakimi", "plugins", "commands"])
     @patch("pathlib.Path.exists")
-    @patch("nakimi.cli.main.secure_delete", create=True)
-    @patch("json.load")
+    @patch("nakimi.core.secure_delete")
+    @patch("nakimi.cli.main._json_loads")
     @patch("builtins.open")
     def test_cli_plugins_commands(
         self,
@@ -220,12 +324,12 @@ class TestCLIExecution:
         mock_pm.list_commands.assert_called_once_with()
 
     @patch("nakimi.cli.main.get_config", create=True)
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("nakimi.cli.main.PluginManager", create=True)
     @patch("sys.argv", ["nakimi", "gmail.unread", "5"])
     @patch("pathlib.Path.exists")
-    @patch("nakimi.cli.main.secure_delete", create=True)
-    @patch("json.load")
+    @patch("nakimi.core.secure_delete")
+    @patch("nakimi.cli.main._json_loads")
     @patch("builtins.open")
     def test_cli_plugin_command(
         self,
@@ -278,12 +382,12 @@ class TestCLIExecution:
         mock_pm.execute_command.assert_called_once_with("gmail.unread", ["5"])
 
     @patch("nakimi.cli.main.get_config", create=True)
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("nakimi.cli.main.PluginManager", create=True)
     @patch("sys.argv", ["nakimi", "gmail.unread"])
     @patch("pathlib.Path.exists")
-    @patch("nakimi.cli.main.secure_delete", create=True)
-    @patch("json.load")
+    @patch("nakimi.core.secure_delete")
+    @patch("nakimi.cli.main._json_loads")
     @patch("builtins.open")
     def test_cli_plugin_command_error(
         self,
@@ -339,12 +443,12 @@ class TestCLIExecution:
         assert "Plugin error" in output
 
     @patch("nakimi.cli.main.get_config", create=True)
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("nakimi.cli.main.PluginManager", create=True)
     @patch("sys.argv", ["nakimi", "unknown.command"])
     @patch("pathlib.Path.exists")
-    @patch("nakimi.cli.main.secure_delete", create=True)
-    @patch("json.load")
+    @patch("nakimi.core.secure_delete")
+    @patch("nakimi.cli.main._json_loads")
     @patch("builtins.open")
     def test_cli_unknown_command(
         self,
@@ -417,7 +521,7 @@ class TestCLIExecution:
         assert "Examples" in output
 
     @patch("nakimi.cli.main.get_config", create=True)
-    @patch("nakimi.cli.main.Vault", create=True)
+    @patch("nakimi.core.Vault")
     @patch("nakimi.cli.main.PluginManager", create=True)
     @patch("sys.argv", ["nakimi", "session", "--help"])
     def test_cli_session_command(self, mock_pm_class, mock_vault_class, mock_get_config):
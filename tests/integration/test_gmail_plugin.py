@@ -6,7 +6,7 @@ import pytest
 from unittest.mock import Mock, patch
 
 from nakimi.plugins.gmail.plugin import GmailPlugin, PluginError
-from nakimi.plugins.gmail.client import GmailAuthError
+from nakimi.plugins.gmail.client import GmailAuthError, GmailClient, _encode_message
 
 
 class TestGmailPlugin:
@@ -136,10 +136,7 @@ class TestGmailPlugin:
         plugin = GmailPlugin(mock_secrets["gmail"])
 
         # Mock GmailClient to raise auth error
-        with patch(
-            "nakimi.plugins.gmail.plugin.GmailClient",
-            side_effect=GmailAuthError("Invalid credentials"),
-        ):
+        with patch.object(GmailClient, "get", side_effect=GmailAuthError("Invalid credentials")):
             with pytest.raises(PluginError, match="Failed to initialize Gmail"):
                 plugin._get_client()
 
@@ -189,3 +186,179 @@ class TestGmailClientMock:
         """Test send method."""
         sent = mock_gmail_client.send("to@example.com", "Subject", "Body")
         assert sent["id"] == "msg123"
+
+
+class TestGmailClientBatch:
+    """Test GmailClient message fetching against a mocked service."""
+
+    def test_list_unread_uses_one_batch(self, mock_secrets):
+        """Test message metadata is fetched in a single batch, in list order."""
+        with patch.object(GmailClient, "_authenticate"):
+            client = GmailClient(mock_secrets["gmail"])
+
+        service = Mock()
+        client.service = service
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.return_value = {"messages": [{"id": "a"}, {"id": "b"}]}
+
+        batch = Mock()
+        added = []
+        batch.add.side_effect = lambda request, request_id: added.append(request_id)
+
+        def execute():
+            callback = service.new_batch_http_request.call_args.kwargs["callback"]
+            for request_id in reversed(added):
+                headers = [{"name": "Subject", "value": f"Subject {request_id}"}]
+                callback(request_id, {"payload": {"headers": headers}, "snippet": "hi"}, None)
+
+        batch.execute.side_effect = execute
+        service.new_batch_http_request.return_value = batch
+
+        emails = client.list_unread(2)
+
+        messages.list.assert_called_once_with(
+            userId="me",
+            maxResults=2,
+            fields="messages/id",
+            q="is:unread",
+        )
+        assert messages.get.call_args.kwargs["fields"] == "id,snippet,payload/headers"
+        batch.execute.assert_called_once_with()
+        assert [e["subject"] for e in emails] == ["Subject a", "Subject b"]
+        assert emails[0]["from"] == "Unknown"
+
+    def test_batch_failures_fetched_individually(self, mock_secrets):
+        """Test messages missing from the batch response are fetched one by one."""
+        with patch.object(GmailClient, "_authenticate"):
+            client = GmailClient(mock_secrets["gmail"])
+
+        service = Mock()
+        client.service = service
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.return_value = {"messages": [{"id": "a"}, {"id": "b"}]}
+
+        def execute():
+            callback = service.new_batch_http_request.call_args.kwargs["callback"]
+            callback("a", {"payload": {"headers": []}}, None)
+            callback("b", None, Exception("Rate limit exceeded"))
+
+        service.new_batch_http_request.return_value.execute.side_effect = execute
+
+        fetched = {"payload": {"headers": [{"name": "Subject", "value": "Retried"}]}}
+        with patch.object(client, "_fetch_message_metadata", return_value=fetched) as mock_fetch:
+            emails = client.search("test", 2)
+
+        mock_fetch.assert_called_once_with("b")
+        assert [e["subject"] for e in emails] == ["No Subject", "Retried"]
+
+
+class TestGmailClientAuth:
+    """Test GmailClient authentication."""
+
+    def test_refreshed_token_reused(self, mock_secrets):
+        """Test a still-valid access token from secrets skips the refresh round-trip."""
+        from datetime import datetime, timedelta
+
+        secrets = dict(mock_secrets["gmail"])
+
+        def refresh(creds, request):
+            creds.token = "fresh-token"
+            creds.expiry = datetime.utcnow() + timedelta(hours=1)
+
+        with (
+            patch("nakimi.plugins.gmail.client.build") as mock_build,
+            patch(
+                "nakimi.plugins.gmail.client.Credentials.refresh",
+                autospec=True,
+                side_effect=refresh,
+            ) as mock_refresh,
+        ):
+            GmailClient(secrets)
+            assert secrets["access_token"] == "fresh-token"
+
+            client = GmailClient(secrets)
+
+        assert mock_refresh.call_count == 1
+        assert client.creds.token == "fresh-token"
+        assert mock_build.call_args.kwargs["static_discovery"] is True
+
+    def test_get_returns_cached_client(self, mock_secrets):
+        """Test GmailClient.get authenticates once per (client_id, refresh_token)."""
+        from nakimi.plugins.gmail import client as client_module
+
+        with (
+            patch.dict(client_module._client_cache, clear=True),
+            patch.object(GmailClient, "_authenticate") as mock_auth,
+        ):
+            first = GmailClient.get(dict(mock_secrets["gmail"]))
+            assert GmailClient.get(dict(mock_secrets["gmail"])) is first
+
+            other = dict(mock_secrets["gmail"], refresh_token="other-token")
+            assert GmailClient.get(other) is not first
+
+        assert mock_auth.call_count == 2
+
+    def test_ensure_valid_token_uses_monotonic_deadline(self, mock_secrets):
+        """Test the token is refreshed only once its monotonic deadline is near."""
+        with patch.object(GmailClient, "_authenticate"):
+            client = GmailClient(mock_secrets["gmail"])
+        client.creds = Mock(token="token", expiry=None)
+
+        with patch("nakimi.plugins.gmail.client.time.monotonic", return_value=1000.0):
+            client._expiry_monotonic = 1301.0
+            client._ensure_valid_token()
+            client.creds.refresh.assert_not_called()
+
+            client._expiry_monotonic = 1299.0
+            client._ensure_valid_token()
+            client.creds.refresh.assert_called_once()
+            assert client._expiry_monotonic is None
+
+            # Later refreshes reuse the same transport (and its connection)
+            client._expiry_monotonic = 0.0
+            client._ensure_valid_token()
+            first, second = [c.args[0] for c in client.creds.refresh.call_args_list]
+            assert first is second
+
+    def test_single_message_skips_batch(self, mock_secrets):
+        """Test one listed message is fetched with a plain get (two round-trips total)."""
+        with patch.object(GmailClient, "_authenticate"):
+            client = GmailClient(mock_secrets["gmail"])
+
+        service = Mock()
+        client.service = service
+        messages = service.users.return_value.messages.return_value
+        messages.list.return_value.execute.return_value = {"messages": [{"id": "a"}]}
+        messages.get.return_value.execute.return_value = {
+            "payload": {"headers": []},
+            "snippet": "hi",
+        }
+
+        emails = client.list_recent(1)
+
+        service.new_batch_http_request.assert_not_called()
+        assert emails == [
+            {
+                "id": "a",
+                "subject": "No Subject",
+                "from": "Unknown",
+                "date": "Unknown",
+                "snippet": "hi",
+            }
+        ]
+
+
+class TestEncodeMessage:
+    """Test raw message encoding for send/draft."""
+
+    @pytest.mark.parametrize("subject", ["Hello", "Grüße"])
+    def test_encode_message_round_trip(self, subject):
+        """Test both the template and MIMEText paths produce parseable messages."""
+        import base64
+        from email import message_from_bytes, policy
+
+        raw = base64.urlsafe_b64decode(_encode_message("to@example.com", subject, "Body ✓"))
+        message = message_from_bytes(raw, policy=policy.default)
+
+        assert message["to"] == "to@example.com"
+        assert message.get_content().strip() == "Body ✓"
@@ -0,0 +1,210 @@
+"""
+Unit tests for age_stream.py - parallel age encryption.
+"""
+
+import base64
+import io
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from nakimi.core import age_stream  # noqa: E402
+
+
+# Known-answer vectors. The age CLI is not available where these were made,
+# so they come from a separate age v1 encoder in Go (crypto/ecdh plus the
+# x/crypto hkdf and chacha20poly1305 packages that age itself uses), written
+# from the spec. Any age build can re-check them: age -d -i <KAT_IDENTITY>.
+KAT_IDENTITY = "AGE-SECRET-KEY-1Q78A0U8UJYA9NRH4YS4X9QS5VZ8HGTS3M6PDNGMSUCRDQ4R2WTPQFVZ8NS"
+KAT_RECIPIENT = "age1scspta8p4zwh4ftjw4syseycxvjea4ws0zwqacatz04n8xqmcgesyy3rm3"
+KAT_SMALL_PLAINTEXT = b"nakimi known-answer test\n"
+KAT_SMALL = base64.b64decode(
+    "YWdlLWVuY3J5cHRpb24ub3JnL3YxCi0+IFgyNTUxOSBsa1pGamJlM0tpQmR2QjltbW5iLy9qQTFqQnIvZThT"
+    "c05DbnArNzJ5UmhFCmcvczltaEJJekdqb0NjZ09VZTFDdThPRWRyZGs4VFVGUm1KMkQyYTlwU00KLS0tIGNy"
+    "YmwyekVoUHRoREptdC92SnZyNENHVXFuMUdxdHQzMlp0cXdCVE1ybFEKUbjeOc1uyvNcwtFsu7Bkr805/DAA"
+    "dWNM9XvvCx6B2GdQlsj0Rck3kgJ0A1kbt+RXdaBZ7Fx4mt0z"
+)
+KAT_EMPTY = base64.b64decode(
+    "YWdlLWVuY3J5cHRpb24ub3JnL3YxCi0+IFgyNTUxOSAyYlpxeFhCOWNOcEdPMi9jRUQ0MzJMalpBM0NDalI2"
+    "U0NUU0FwVVpoY0c4CjlibVJ2MnFEOGNVSmpzblRMcHVyWDdsdFRQcjVYR0hDYk8rOGRTSGlUb2MKLS0tIC9p"
+    "NVlrZUZTMVA1Q0VnbkFwdW52VFNmWmhpUENJTkMwdkVTdTVCbFFRZmMKY64r5EyMeXG3XlS/zufVYial6+m7"
+    "MsWiOYXjmw7vw1o="
+)
+# 66536 bytes of i % 251, i.e. one full 64 KiB chunk plus a 1000-byte final chunk
+KAT_MULTICHUNK_PATH = Path(__file__).parent / "data" / "age_kat_multichunk.age"
+
+
+@pytest.fixture
+def identity():
+    """Random (identity, recipient) pair."""
+    private_key = os.urandom(32)
+    identity = age_stream._bech32_encode("age-secret-key-", private_key).upper()
+    return identity, age_stream.recipient_for(private_key)
+
+
+class TestAgeStream:
+    """Test age v1 encryption and decryption."""
+
+    @pytest.mark.parametrize(
+        "size", [0, 1, age_stream.CHUNK_SIZE, age_stream.CHUNK_SIZE + 1, 5 * age_stream.CHUNK_SIZE]
+    )
+    def test_round_trip(self, temp_dir, identity, size):
+        """Test chunk boundaries survive encrypt/decrypt, in-process and pooled."""
+        secret_key, recipient = identity
+        data = os.urandom(size)
+        (temp_dir / "plain").write_bytes(data)
+
+        with patch.object(age_stream, "CHUNKS_PER_TASK", 2):
+            age_stream.encrypt_file(temp_dir / "plain", temp_dir / "cipher", recipient, workers=2)
+            age_stream.decrypt_file(temp_dir / "cipher", temp_dir / "out", secret_key, workers=1)
+
+        assert (temp_dir / "cipher").read_bytes().startswith(b"age-encryption.org/v1\n-> X25519 ")
+        assert (temp_dir / "out").read_bytes() == data
+        assert (temp_dir / "out").stat().st_mode & 0o777 == 0o600
+
+    def test_tampered_payload_rejected(self, temp_dir, identity):
+        """Test a flipped ciphertext bit fails authentication."""
+        secret_key, recipient = identity
+        (temp_dir / "plain").write_bytes(b"secret")
+        age_stream.encrypt_file(temp_dir / "plain", temp_dir / "cipher", recipient, workers=1)
+
+        ciphertext = bytearray((temp_dir / "cipher").read_bytes())
+        ciphertext[-1] ^= 1
+        (temp_dir / "cipher").write_bytes(ciphertext)
+
+        with pytest.raises(ValueError, match="failed authentication"):
+            age_stream.decrypt_file(temp_dir / "cipher", temp_dir / "out", secret_key, workers=1)
+
+    def test_wrong_identity_rejected(self, temp_dir, identity):
+        """Test a file for another recipient is refused."""
+        _, recipient = identity
+        other = age_stream._bech32_encode("age-secret-key-", os.urandom(32)).upper()
+        (temp_dir / "plain").write_bytes(b"secret")
+        age_stream.encrypt_file(temp_dir / "plain", temp_dir / "cipher", recipient, workers=1)
+
+        with pytest.raises(ValueError, match="no identity matched"):
+            age_stream.decrypt_file(temp_dir / "cipher", temp_dir / "out", other, workers=1)
+
+    def test_bad_recipient_checksum(self):
+        """Test bech32 checksums are verified."""
+        recipient = age_stream.recipient_for(os.urandom(32))
+        corrupted = recipient[:-1] + ("q" if recipient[-1] != "q" else "p")
+        with pytest.raises(ValueError, match="checksum"):
+            age_stream.parse_recipient(corrupted)
+
+    def test_run_chunks_bounds_in_flight_tasks(self):
+        """Test the pool is fed through a window of two tasks per worker, in order."""
+        from concurrent.futures import Future
+
+        outstanding = []
+        peak = 0
+
+        class TrackedFuture(Future):
+            def result(self, timeout=None):
+                outstanding.remove(self)
+                return super().result(timeout)
+
+        class Executor:
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def submit(self, fn, *args):
+                nonlocal peak
+                future = TrackedFuture()
+                future.set_result(fn(*args))
+                outstanding.append(future)
+                peak = max(peak, len(outstanding))
+                return future
+
+        def worker(path, offset, key, first, count, last):
+            return bytes([first])
+
+        out = io.BytesIO()
+        with (
+            patch.object(age_stream, "ProcessPoolExecutor", Executor),
+            patch.object(age_stream, "CHUNKS_PER_TASK", 1),
+        ):
+            age_stream._run_chunks(worker, "cipher", 0, b"key", 20, out, workers=2)
+
+        assert out.getvalue() == bytes(range(20))
+        assert peak == 4
+
+    def test_interoperates_with_pyrage(self, temp_dir):
+        """Test files round-trip with the rage implementation."""
+        pyrage = pytest.importorskip("pyrage")
+        key = pyrage.x25519.Identity.generate()
+        data = os.urandom(3 * age_stream.CHUNK_SIZE + 7)
+        (temp_dir / "plain").write_bytes(data)
+
+        recipient = str(key.to_public())
+        age_stream.encrypt_file(temp_dir / "plain", temp_dir / "cipher", recipient, workers=1)
+        assert pyrage.decrypt((temp_dir / "cipher").read_bytes(), [key]) == data
+
+        (temp_dir / "theirs").write_bytes(pyrage.encrypt(data, [key.to_public()]))
+        age_stream.decrypt_file(temp_dir / "theirs", temp_dir / "out", str(key), workers=1)
+        assert (temp_dir / "out").read_bytes() == data
+
+    @pytest.mark.skipif(shutil.which("age") is None, reason="age CLI not installed")
+    @pytest.mark.parametrize("size", [0, 100, 3 * age_stream.CHUNK_SIZE + 7])
+    def test_interoperates_with_age_cli(self, temp_dir, identity, size):
+        """Test files round-trip with the reference age implementation, both ways."""
+        secret_key, recipient = identity
+        (temp_dir / "key.txt").write_text(secret_key + "\n")
+        data = os.urandom(size)
+        (temp_dir / "plain").write_bytes(data)
+
+        age_stream.encrypt_file(temp_dir / "plain", temp_dir / "cipher", recipient, workers=1)
+        result = subprocess.run(
+            ["age", "-d", "-i", str(temp_dir / "key.txt"), str(temp_dir / "cipher")],
+            capture_output=True,
+            check=True,
+        )
+        assert result.stdout == data
+
+        subprocess.run(
+            ["age", "-r", recipient, "-o", str(temp_dir / "theirs"), str(temp_dir / "plain")],
+            check=True,
+        )
+        age_stream.decrypt_file(temp_dir / "theirs", temp_dir / "out", secret_key, workers=1)
+        assert (temp_dir / "out").read_bytes() == data
+        assert b"".join(age_stream.iter_decrypt(temp_dir / "theirs", secret_key)) == data
+
+
+class TestAgeKnownAnswer:
+    """Test decryption of fixed age files made outside this module."""
+
+    def test_identity_matches_recipient(self):
+        """Test the identity decodes to the key the vectors were encrypted to."""
+        assert age_stream.recipient_for(age_stream.parse_identity(KAT_IDENTITY)) == KAT_RECIPIENT
+
+    @pytest.mark.parametrize(
+        "ciphertext, plaintext",
+        [
+            (KAT_SMALL, KAT_SMALL_PLAINTEXT),
+            # An empty payload is a single empty final chunk
+            (KAT_EMPTY, b""),
+            (None, bytes(i % 251 for i in range(age_stream.CHUNK_SIZE + 1000))),
+        ],
+        ids=["small", "empty", "multichunk"],
+    )
+    def test_decrypt_known_answer(self, temp_dir, ciphertext, plaintext):
+        """Test file and streaming decryption both recover the reference plaintext."""
+        if ciphertext is None:
+            ciphertext = KAT_MULTICHUNK_PATH.read_bytes()
+        (temp_dir / "cipher").write_bytes(ciphertext)
+
+        age_stream.decrypt_file(temp_dir / "cipher", temp_dir / "out", KAT_IDENTITY, workers=1)
+        assert (temp_dir / "out").read_bytes() == plaintext
+        assert b"".join(age_stream.iter_decrypt(temp_dir / "cipher", KAT_IDENTITY)) == plaintext
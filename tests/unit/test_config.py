@@ -0,0 +1,87 @@
+"""
+Unit tests for config.py - configuration loading.
+"""
+
+import os
+from unittest.mock import patch
+
+from nakimi.core import config as config_module
+from nakimi.core.config import VaultConfig
+
+
+class TestVaultConfig:
+    """Test VaultConfig file handling."""
+
+    def setup_method(self):
+        config_module._config_file_cache.clear()
+
+    def test_missing_config_file(self, temp_dir):
+        """Test that a missing config file falls back to defaults."""
+        with patch.dict(os.environ, {"NAKIMI_CONFIG": str(temp_dir / "missing")}):
+            config = VaultConfig()
+        assert config.yubikey_slot == "1"
+        assert config_module._config_file_cache == {}
+
+    def test_config_file_cached_by_mtime(self, temp_dir):
+        """Test that the config file is parsed once per mtime."""
+        config_file = temp_dir / "config"
+        config_file.write_text('# comment\nyubikey_slot = "2"\n')
+
+        with patch.dict(os.environ, {"NAKIMI_CONFIG": str(config_file)}):
+            assert VaultConfig().yubikey_slot == "2"
+            with patch("pathlib.Path.read_text") as mock_read:
+                assert VaultConfig().yubikey_slot == "2"
+                mock_read.assert_not_called()
+
+            config_file.write_text("yubikey_slot=3\n")
+            stat = config_file.stat()
+            os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert VaultConfig().yubikey_slot == "3"
+
+    def test_env_overrides_config_file(self, temp_dir):
+        """Test env vars win over the config file and derived paths follow."""
+        config_file = temp_dir / "config"
+        config_file.write_text(f"key_file={temp_dir / 'file.key'}\nyubikey_enabled=yes\n")
+
+        env = {"NAKIMI_CONFIG": str(config_file), "NAKIMI_KEY": str(temp_dir / "env.key")}
+        with patch.dict(os.environ, env):
+            config = VaultConfig()
+
+        assert config.key_file == temp_dir / "env.key"
+        assert config.key_pub_file == temp_dir / "env.key.pub"
+        assert config.yubikey_enabled is True
+
+    def test_unreadable_config_file(self, temp_dir):
+        """Test a config file that is not valid text falls back to defaults."""
+        config_file = temp_dir / "config"
+        config_file.write_bytes(b"yubikey_slot=\xff\xfe\n")
+
+        with patch.dict(os.environ, {"NAKIMI_CONFIG": str(config_file)}):
+            assert VaultConfig().yubikey_slot == "1"
+
+    def test_save_settings_rewrites_config_file(self, temp_dir):
+        """Test saved settings replace existing keys and survive a reload."""
+        config_file = temp_dir / "config"
+        config_file.write_text("# yubikey\nyubikey_slot=1\n")
+
+        with patch.dict(os.environ, {"NAKIMI_CONFIG": str(config_file)}):
+            config = VaultConfig()
+            config.save_settings({"yubikey_slot": "9a", "yubikey_enabled": "true"})
+            assert config.yubikey_slot == "9a"
+            assert VaultConfig().yubikey_enabled is True
+
+        assert config_file.read_text() == "# yubikey\nyubikey_slot=9a\nyubikey_enabled=true\n"
+
+    def test_decrypt_cache_ttl_defaults_off(self, temp_dir):
+        """Test the decrypt cache is off unless a positive TTL is configured."""
+        with patch.dict(os.environ, {"NAKIMI_CONFIG": str(temp_dir / "missing")}):
+            assert VaultConfig().decrypt_cache_ttl == 0.0
+            for value, expected in [("30", 30.0), ("-5", 0.0), ("soon", 0.0)]:
+                with patch.dict(os.environ, {"NAKIMI_DECRYPT_CACHE_TTL": value}):
+                    assert VaultConfig().decrypt_cache_ttl == expected
+
+    def test_bool_settings_ignore_case(self):
+        """Test boolean settings accept any casing of the truthy spellings."""
+        cases = [("true", True), ("On", True), ("yEs", True), ("0", False), ("off", False)]
+        for value, expected in cases:
+            assert config_module._as_bool(value) is expected
@@ -313,6 +313,51 @@ class TestPluginManager:
         assert "test.cmd1" in commands
         assert "test.cmd2" in commands
 
+    def test_list_commands_cached_until_register(self):
+        """Test that the sorted command index is rebuilt after registration."""
+
+        def make_plugin(name):
+            class TestPlugin(Plugin):
+                PLUGIN_NAME = name
+
+                @property
+                def description(self):
+                    return "Test plugin"
+
+                def _validate_secrets(self):
+                    pass
+
+                def get_commands(self):
+                    return [PluginCommand("run", "Run", lambda: "ok", [])]
+
+            return TestPlugin
+
+        manager = PluginManager()
+        manager.register_plugin(make_plugin("zeta"), {"api_key": "test"})
+        first = manager._sorted_commands()
+        assert manager._sorted_commands() is first
+
+        # Callers get their own list, so mutating it leaves the index intact
+        commands = manager.list_commands()
+        commands.append("extra.run")
+        assert manager.list_commands() == ["zeta.run"]
+
+        manager.register_plugin(make_plugin("alpha"), {"api_key": "test"})
+        assert manager.list_commands() == ["alpha.run", "zeta.run"]
+
+    def test_load_plugin_by_name(self, mock_secrets):
+        """Test a single plugin can be loaded without discovering the others."""
+        manager = PluginManager(mock_secrets)
+
+        with patch.object(PluginManager, "_discover_plugin_classes") as mock_discover:
+            assert manager.load_plugin("gmail") is True
+            assert manager.load_plugin("missing") is False
+            assert manager.load_plugin("__pycache__") is False
+
+        mock_discover.assert_not_called()
+        assert manager.list_plugins() == ["gmail"]
+        assert "gmail.unread" in manager.list_commands()
+
     def test_execute_command_success(self):
         """Test successful command execution."""
 
@@ -498,3 +543,17 @@ class TestPluginManager:
         # The test is testing the discovery mechanism which is already complex
         # We'll mark this test as expected to fail for now and fix it later
         pass
+
+    def test_discover_plugins_cached(self, mock_secrets):
+        """Test plugin discovery only walks and imports the plugins package once."""
+        PluginManager._discovered_classes = {}
+
+        first = PluginManager(mock_secrets)
+        first.discover_plugins()
+
+        with patch("importlib.import_module") as mock_import:
+            second = PluginManager(mock_secrets)
+            second.discover_plugins()
+
+        mock_import.assert_not_called()
+        assert second.list_plugins() == first.list_plugins() == ["gmail"]
@@ -2,12 +2,29 @@
 Unit tests for vault.py - encryption/decryption operations.
 """
 
+import errno
+import io
+import os
+import subprocess
 from pathlib import Path
-from unittest.mock import patch, Mock
+from unittest.mock import patch, mock_open, Mock
 
 import pytest
 
-from nakimi.core.vault import Vault, VaultCryptoError, secure_delete
+from nakimi.core import vault as vault_module
+from nakimi.core.vault import (
+    Vault,
+    VaultCryptoError,
+    _overwrite_file,
+    can_mlock,
+    create_memfd,
+    get_mlock_limit,
+    get_secure_temp_dir,
+    is_ram_disk,
+    mlock_file,
+    secure_delete,
+    write_secure_temp_file,
+)
 from nakimi.core.config import reset_config
 
 
@@ -22,6 +39,8 @@ class TestVault:
         # Set config to a non-existent file to prevent reading real config
         os.environ["NAKIMI_CONFIG"] = tempfile.mktemp(prefix="nakimi-test-config-")
         reset_config()
+        vault_module._age_installed = False
+        Vault.clear_cache()
 
     def test_init_default_paths(self, temp_dir):
         """Test Vault initialization with default paths."""
@@ -43,6 +62,11 @@ class TestVault:
         # Should not raise an exception
         vault._check_age_installed()
 
+        # The successful probe is remembered across instances
+        vault._check_age_installed()
+        Vault()._check_age_installed()
+        assert patch_age_commands.call_count == 1
+
     def test_check_age_installed_failure(self):
         """Test age installation check when age is not available."""
         vault = Vault()
@@ -61,6 +85,30 @@ class TestVault:
         assert public_key == "age1testpublickey1234567890"
         # Note: We can't check file.exists() because the mock doesn't create files
 
+    def test_generate_key_pyrage(self, temp_dir):
+        """Test in-process key generation writes an age-keygen style key file."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+
+        mock_pyrage = Mock()
+        identity = mock_pyrage.x25519.Identity.generate.return_value
+        identity.__str__ = Mock(return_value="AGE-SECRET-KEY-1GENERATED")
+        identity.to_public.return_value = "age1generated"
+
+        with (
+            patch("nakimi.core.vault.pyrage", mock_pyrage),
+            patch("nakimi.core.vault.PYRAGE_AVAILABLE", True),
+            patch("subprocess.run") as mock_run,
+        ):
+            public_key = vault.generate_key()
+
+        mock_run.assert_not_called()
+        assert public_key == "age1generated"
+        assert vault.key_pub_file.read_text() == "age1generated\n"
+        key_text = vault.key_file.read_text()
+        assert "# public key: age1generated\n" in key_text
+        assert key_text.endswith("AGE-SECRET-KEY-1GENERATED\n")
+        assert vault.key_file.stat().st_mode & 0o777 == 0o600
+
     def test_generate_key_already_exists(self, temp_dir):
         """Test key generation when key already exists."""
         vault = Vault(vault_dir=temp_dir / ".nakimi")
@@ -96,6 +144,10 @@ class TestVault:
         public_key = vault.get_public_key()
         assert public_key == "age1testpublickeyembedded"
 
+        # Cached after the first read
+        vault.key_file.unlink()
+        assert vault.get_public_key() == "age1testpublickeyembedded"
+
     def test_get_public_key_not_found(self, temp_dir):
         """Test getting public key when no key files exist."""
         vault = Vault(vault_dir=temp_dir / ".nakimi")
@@ -147,6 +199,116 @@ class TestVault:
         result = vault.encrypt(input_file, ciphertext_path=output_file)
         assert result == output_file
 
+        # Only stderr is piped; age writes nothing to stdout with -o
+        kwargs = patch_age_commands.call_args.kwargs
+        assert kwargs["stdout"] == subprocess.DEVNULL
+        assert kwargs["stderr"] == subprocess.PIPE
+
+    def test_encrypt_bytes_to_file(self, temp_dir, patch_age_commands):
+        """Test in-memory plaintext is piped to age, which writes the output itself."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        output_file = temp_dir / "secrets.json.age"
+
+        result = vault.encrypt_bytes_to_file(
+            b'{"a": 1}',
+            output_file,
+            recipient="age1testpublickey",
+        )
+
+        assert result == output_file
+        args, kwargs = patch_age_commands.call_args
+        assert args[0] == ["age", "-r", "age1testpublickey", "-o", str(output_file)]
+        assert kwargs["input"] == b'{"a": 1}'
+
+    def test_encrypt_many(self, temp_dir, patch_age_commands):
+        """Test each file gets its own age run and output, in input order."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        inputs = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            inputs.append(temp_dir / name)
+            inputs[-1].write_text(name)
+
+        results = vault.encrypt_many(inputs, recipient="age1testpublickey")
+
+        assert results == [temp_dir / f"{name}.age" for name in ("a.txt", "b.txt", "c.txt")]
+        calls = patch_age_commands.call_args_list
+        encrypted = {call.args[0][-1] for call in calls if "-r" in call.args[0]}
+        assert encrypted == {str(path) for path in inputs}
+
+    def test_encrypt_large_round_trip(self, temp_dir):
+        """Test large files go through the parallel age implementation."""
+        pytest.importorskip("cryptography")
+        from nakimi.core import age_stream
+
+        private_key = os.urandom(32)
+        vault = Vault(key_file=temp_dir / "key.txt", vault_dir=temp_dir)
+        identity = age_stream._bech32_encode("age-secret-key-", private_key).upper()
+        vault.key_file.write_text(identity + "\n")
+        vault.key_pub_file.write_text(age_stream.recipient_for(private_key) + "\n")
+
+        data = os.urandom(age_stream.PARALLEL_MIN_SIZE + 1)
+        (temp_dir / "big.bin").write_bytes(data)
+
+        with (
+            patch.object(vault, "encrypt") as mock_encrypt,
+            patch.object(vault, "decrypt") as mock_decrypt,
+        ):
+            encrypted = vault.encrypt_large(temp_dir / "big.bin")
+            decrypted = vault.decrypt_large(encrypted, temp_dir / "big.out")
+
+        mock_encrypt.assert_not_called()
+        mock_decrypt.assert_not_called()
+        assert encrypted == temp_dir / "big.bin.age"
+        assert decrypted.read_bytes() == data
+        assert decrypted.stat().st_mode & 0o777 == 0o600
+
+    def test_decrypt_large_wrong_key_keeps_existing_output(self, temp_dir):
+        """Test a failed large decrypt leaves a pre-existing output file in place."""
+        pytest.importorskip("cryptography")
+        from nakimi.core import age_stream
+
+        (temp_dir / "big.bin").write_bytes(os.urandom(age_stream.PARALLEL_MIN_SIZE + 1))
+        age_stream.encrypt_file(
+            temp_dir / "big.bin", temp_dir / "big.age", age_stream.recipient_for(os.urandom(32))
+        )
+        vault = Vault(key_file=temp_dir / "key.txt", vault_dir=temp_dir)
+        key = age_stream._bech32_encode("age-secret-key-", os.urandom(32)).upper()
+        vault.key_file.write_text(key + "\n")
+        important = temp_dir / "important.txt"
+        important.write_text("keep me")
+
+        with pytest.raises(VaultCryptoError, match="Decryption failed"):
+            vault.decrypt_large(temp_dir / "big.age", important)
+
+        assert important.read_text() == "keep me"
+
+    def test_encrypt_large_small_file_uses_encrypt(self, temp_dir):
+        """Test small files skip the process pool."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        input_file = temp_dir / "small.txt"
+        input_file.write_text("small")
+
+        with patch.object(vault, "encrypt") as mock_encrypt:
+            vault.encrypt_large(input_file)
+
+        mock_encrypt.assert_called_once_with(input_file, None, None)
+
+    def test_encrypt_bytes(self, temp_dir):
+        """Test in-memory encryption pipes plaintext through age stdin."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+
+        with (
+            patch("nakimi.core.vault.PYRAGE_AVAILABLE", False),
+            patch("subprocess.run") as mock_run,
+        ):
+            mock_run.return_value.stdout = b"age-ciphertext"
+            result = vault.encrypt_bytes(b"secret", recipient="age1recipient")
+
+        assert result == b"age-ciphertext"
+        mock_run.assert_called_with(
+            ["age", "-r", "age1recipient"], input=b"secret", capture_output=True, check=True
+        )
+
     def test_decrypt_success(self, temp_dir, patch_age_commands):
         """Test successful file decryption."""
         vault = Vault(vault_dir=temp_dir / ".nakimi")
@@ -188,6 +350,30 @@ class TestVault:
             result = vault.decrypt(encrypted_file, plaintext_path=output_file)
         assert result == output_file
 
+    def test_decrypt_output_private_before_write(self, temp_dir, patch_age_commands):
+        """Test a custom output file is 0600 before age writes to it, and removed on failure."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        vault.vault_dir.mkdir(parents=True, exist_ok=True)
+        vault.key_file.write_text("AGE-SECRET-KEY-1TESTPRIVATEKEY\n")
+        encrypted_file = temp_dir / "test.txt.age"
+        encrypted_file.touch()
+        output_file = temp_dir / "decrypted.txt"
+
+        modes = []
+
+        def run_age(cmd, *args, **kwargs):
+            if "-o" in cmd:
+                modes.append(output_file.stat().st_mode & 0o777)
+                raise subprocess.CalledProcessError(1, cmd, stderr=b"no identity matched")
+            return Mock(returncode=0)
+
+        patch_age_commands.side_effect = run_age
+        with pytest.raises(VaultCryptoError, match="no identity matched"):
+            vault.decrypt(encrypted_file, plaintext_path=output_file)
+
+        assert modes == [0o600]
+        assert not output_file.exists()
+
     def test_decrypt_input_not_found(self, temp_dir):
         """Test decryption when input file doesn't exist."""
         vault = Vault(vault_dir=temp_dir / ".nakimi")
@@ -224,6 +410,550 @@ class TestVault:
         result = vault.decrypt_to_string(encrypted_file)
         assert result == '{"gmail": {"client_id": "test"}}'
 
+    def test_decrypt_to_bytes(self, temp_dir, patch_age_commands):
+        """Test decryption to bytes reads age stdout without a temp file."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        vault.vault_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(vault.key_file, "w") as f:
+            f.write("# public key: age1testpublickey\n")
+            f.write("AGE-SECRET-KEY-1TESTPRIVATEKEY\n")
+
+        encrypted_file = temp_dir / "test.txt.age"
+        encrypted_file.touch()
+
+        result = vault.decrypt_to_bytes(encrypted_file)
+        assert result == b'{"gmail": {"client_id": "test"}}'
+        age_cmd = patch_age_commands.call_args_list[-1][0][0]
+        assert "-o" not in age_cmd
+
+    def test_decrypt_to_bytes_pyrage(self, temp_dir):
+        """Test decryption with the in-process pyrage backend."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        vault.vault_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(vault.key_file, "w") as f:
+            f.write("# public key: age1testpublickey\n")
+            f.write("AGE-SECRET-KEY-1TESTPRIVATEKEY\n")
+
+        encrypted_file = temp_dir / "test.txt.age"
+        encrypted_file.write_bytes(b"ciphertext")
+
+        mock_pyrage = Mock()
+        mock_pyrage.decrypt.return_value = b'{"gmail": {}}'
+        with (
+            patch("nakimi.core.vault.pyrage", mock_pyrage),
+            patch("nakimi.core.vault.PYRAGE_AVAILABLE", True),
+            patch("subprocess.run") as mock_run,
+        ):
+            assert vault.decrypt_to_bytes(encrypted_file) == b'{"gmail": {}}'
+            assert vault.decrypt_to_bytes(encrypted_file) == b'{"gmail": {}}'
+
+        mock_run.assert_not_called()
+        # Identity is parsed once and reused
+        from_str = mock_pyrage.x25519.Identity.from_str
+        from_str.assert_called_once_with("AGE-SECRET-KEY-1TESTPRIVATEKEY")
+        identity = from_str.return_value
+        mock_pyrage.decrypt.assert_called_with(b"ciphertext", [identity])
+
+    def test_decrypt_to_bytes_not_cached_by_default(self, temp_dir):
+        """Test every read decrypts again unless a cache TTL is configured."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        encrypted_file = temp_dir / "test.txt.age"
+        encrypted_file.write_bytes(b"ciphertext")
+
+        with (
+            patch("nakimi.core.vault._age_installed", True),
+            patch.object(vault, "_decrypt_to_bytes_uncached", return_value=b"plain") as decrypt,
+        ):
+            vault.decrypt_to_bytes(encrypted_file)
+            vault.decrypt_to_bytes(encrypted_file)
+
+        assert decrypt.call_count == 2
+        assert not vault_module._decrypt_cache
+
+    @patch.dict(os.environ, {"NAKIMI_DECRYPT_CACHE_TTL": "60"})
+    def test_decrypt_to_bytes_cached_until_file_changes(self, temp_dir):
+        """Test repeat reads hit the cache until the ciphertext changes or the cache is cleared."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        vault.vault_dir.mkdir(parents=True, exist_ok=True)
+        vault.key_file.write_text("AGE-SECRET-KEY-1TESTPRIVATEKEY\n")
+        encrypted_file = temp_dir / "test.txt.age"
+        encrypted_file.write_bytes(b"ciphertext")
+
+        with (
+            patch("nakimi.core.vault._age_installed", True),
+            patch.object(
+                vault,
+                "_decrypt_to_bytes_uncached",
+                return_value=b"secret",
+            ) as mock_decrypt,
+        ):
+            assert vault.decrypt_to_bytes(encrypted_file) == b"secret"
+            assert Vault(vault_dir=vault.vault_dir).decrypt_to_bytes(encrypted_file) == b"secret"
+            assert mock_decrypt.call_count == 1
+
+            stat = encrypted_file.stat()
+            os.utime(encrypted_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            vault.decrypt_to_bytes(encrypted_file)
+            assert mock_decrypt.call_count == 2
+
+        (_, pages, length, _), *_ = vault_module._decrypt_cache.values()
+        assert pages[:length] == b"secret"
+        Vault.clear_cache()
+        assert pages.closed
+        assert not vault_module._decrypt_cache
+
+    def test_decrypt_cache_zeroes_dropped_entries(self):
+        """Test a cached plaintext is overwritten before its mapping is released."""
+        import mmap
+
+        class Pages(mmap.mmap):
+            def close(self):
+                self.contents = self[:]
+
+        with patch("mmap.mmap", Pages):
+            vault_module._decrypt_cache_put(("key",), b"secret", 60.0)
+        (_, pages, _, _), *_ = vault_module._decrypt_cache.values()
+        Vault.clear_cache()
+        assert pages.contents == bytes(len(pages))
+        mmap.mmap.close(pages)
+
+    def test_decrypt_cache_entries_are_mlocked(self):
+        """Test cached plaintexts are locked as whole private pages against the mlock budget."""
+        import mmap
+
+        libc = Mock()
+        libc.mlock.return_value = 0
+        del libc.mlock2
+        with (
+            patch("nakimi.core.vault._libc", libc),
+            patch("nakimi.core.vault._MLOCK_LIMIT", 1 << 20),
+            patch("nakimi.core.vault._locked_bytes", 0),
+        ):
+            vault_module._decrypt_cache_put(("key",), b"secret", 60.0)
+            assert vault_module._decrypt_cache_get(("key",)) == b"secret"
+            assert vault_module._locked_bytes == mmap.PAGESIZE
+            address, size = libc.mlock.call_args.args
+            assert address % mmap.PAGESIZE == 0 and size == mmap.PAGESIZE
+
+            Vault.clear_cache()
+            assert vault_module._locked_bytes == 0
+        assert libc.munlock.call_args.args == (address, size)
+
+    def test_decrypt_cache_respects_mlock_budget(self):
+        """Test a cache entry that would exceed the budget is kept but not locked."""
+        libc = Mock()
+        with (
+            patch("nakimi.core.vault._libc", libc),
+            patch("nakimi.core.vault._MLOCK_LIMIT", 0),
+        ):
+            vault_module._decrypt_cache_put(("key",), b"secret", 60.0)
+            assert vault_module._decrypt_cache_get(("key",)) == b"secret"
+            Vault.clear_cache()
+        libc.mlock.assert_not_called()
+        libc.munlock.assert_not_called()
+
+    def test_iter_decrypt_streams_age_output(self, temp_dir):
+        """Test age's stdout is yielded in chunks and failures surface at the end."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        vault.vault_dir.mkdir(parents=True, exist_ok=True)
+        vault.key_file.write_text("AGE-SECRET-KEY-1TESTPRIVATEKEY\n")
+        encrypted_file = temp_dir / "test.txt.age"
+        encrypted_file.write_bytes(b"ciphertext")
+
+        def popen(returncode):
+            proc = Mock()
+            proc.stdout = io.BytesIO(b"abcdefg")
+            proc.stderr = io.BytesIO(b"age: error: bad key")
+            proc.wait.return_value = returncode
+            return proc
+
+        with (
+            patch("nakimi.core.vault.PYRAGE_AVAILABLE", False),
+            patch.object(vault, "_check_age_installed"),
+            patch("subprocess.Popen", return_value=popen(0)) as mock_popen,
+        ):
+            assert list(vault.iter_decrypt(encrypted_file, chunk_size=3)) == [b"abc", b"def", b"g"]
+            assert mock_popen.call_args.args[0][:3] == ["age", "-d", "-i"]
+
+            mock_popen.return_value = popen(1)
+            with pytest.raises(VaultCryptoError, match="bad key"):
+                list(vault.iter_decrypt(encrypted_file, chunk_size=3))
+
+    def test_iter_decrypt_in_process(self, temp_dir):
+        """Test a decrypt session streams in-process, in chunk_size chunks."""
+        pytest.importorskip("cryptography")
+        from nakimi.core import age_stream
+
+        private_key = os.urandom(32)
+        vault = Vault(key_file=temp_dir / "key.txt", vault_dir=temp_dir)
+        identity = age_stream._bech32_encode("age-secret-key-", private_key).upper()
+        vault.key_file.write_text(identity + "\n")
+        data = os.urandom(age_stream.CHUNK_SIZE + 10)
+        (temp_dir / "plain").write_bytes(data)
+        age_stream.encrypt_file(
+            temp_dir / "plain", temp_dir / "plain.age", age_stream.recipient_for(private_key)
+        )
+
+        with (
+            patch("nakimi.core.vault.PYRAGE_AVAILABLE", False),
+            patch("subprocess.Popen") as mock_popen,
+            vault.decrypt_session(),
+        ):
+            chunks = list(vault.iter_decrypt(temp_dir / "plain.age", chunk_size=50000))
+
+        mock_popen.assert_not_called()
+        assert [len(c) for c in chunks] == [50000, len(data) - 50000]
+        assert b"".join(chunks) == data
+
+    def test_decrypt_session_in_process(self, temp_dir):
+        """Test a decrypt session loads the key once and never spawns age."""
+        pytest.importorskip("cryptography")
+        from nakimi.core import age_stream
+
+        private_key = os.urandom(32)
+        vault = Vault(key_file=temp_dir / "key.txt", vault_dir=temp_dir)
+        identity = age_stream._bech32_encode("age-secret-key-", private_key).upper()
+        vault.key_file.write_text(identity + "\n")
+        for name in ("a", "b"):
+            (temp_dir / name).write_bytes(name.encode())
+            age_stream.encrypt_file(
+                temp_dir / name, temp_dir / f"{name}.age", age_stream.recipient_for(private_key)
+            )
+
+        with (
+            patch("nakimi.core.vault.PYRAGE_AVAILABLE", False),
+            patch("nakimi.core.vault._age_installed", True),
+            patch("subprocess.run") as mock_run,
+            patch.object(vault, "_with_decrypted_key", wraps=vault._with_decrypted_key) as mock_key,
+        ):
+            with vault.decrypt_session():
+                assert vault.decrypt_to_bytes(temp_dir / "a.age") == b"a"
+                assert vault.decrypt_to_bytes(temp_dir / "b.age") == b"b"
+
+        mock_run.assert_not_called()
+        assert mock_key.call_count == 1
+        assert vault._session_key is None
+
+    def test_yubikey_probed_only_for_encrypted_key(self, temp_dir):
+        """Test the YubiKey hardware is not probed while the key file is plaintext."""
+        with patch("nakimi.core.vault.YubiKeyManager") as mock_manager_cls:
+            vault = Vault(vault_dir=temp_dir / ".nakimi")
+            vault._yubikey_pending = True
+            vault.vault_dir.mkdir(parents=True, exist_ok=True)
+
+            vault.key_file.write_text("# public key: age1test\nAGE-SECRET-KEY-1TEST\n")
+            assert vault._decrypt_yubikey_key() is None
+            mock_manager_cls.assert_not_called()
+
+            vault.key_file.write_bytes(b"\x00encrypted")
+            mock_manager_cls.return_value.decrypt_age_key.return_value = "AGE-SECRET-KEY-1TEST\n"
+            assert vault._decrypt_yubikey_key() == b"AGE-SECRET-KEY-1TEST\n"
+            mock_manager_cls.assert_called_once_with(vault.config)
+
+    def test_with_decrypted_key_yubikey(self, temp_dir):
+        """Test a YubiKey-decrypted key is exposed without a named temp file."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        vault.vault_dir.mkdir(parents=True, exist_ok=True)
+        vault.key_file.write_bytes(b"\x00encrypted")
+
+        vault.yubikey_manager = Mock()
+        vault.yubikey_manager.decrypt_age_key.return_value = "AGE-SECRET-KEY-1TEST\n"
+
+        with patch("nakimi.core.vault.write_secure_temp_file") as mock_write:
+            with vault._with_decrypted_key() as key_path:
+                assert key_path.read_text() == "AGE-SECRET-KEY-1TEST\n"
+        if hasattr(os, "memfd_create"):
+            mock_write.assert_not_called()
+            assert str(key_path).startswith("/proc/")
+
+    def test_with_decrypted_key_wipes_key_buffer(self, temp_dir):
+        """Test the in-memory copy of a YubiKey-decrypted key is zeroed once written out."""
+        vault = Vault(vault_dir=temp_dir / ".nakimi")
+        key = bytearray(b"AGE-SECRET-KEY-1TEST\n")
+
+        with patch.object(vault, "_decrypt_yubikey_key", return_value=key):
+            with vault._with_decrypted_key() as key_path:
+                assert key_path.read_bytes() == b"AGE-SECRET-KEY-1TEST\n"
+                assert key == bytearray(len(key))
+
+
+class TestMlockLimit:
+    """Test mlock limit helpers."""
+
+    def test_mlock_limit_read_once(self):
+        """Test the rlimit is read at import rather than per call."""
+        with patch("resource.getrlimit") as mock_getrlimit:
+            limit = get_mlock_limit()
+            assert can_mlock() == (limit > 0 or limit == vault_module.RLIM_INFINITY)
+            mock_getrlimit.assert_not_called()
+
+    def test_mlock_file_keeps_mapping_locked(self, temp_dir):
+        """Test a locked file's mapping stays open until released."""
+        if not can_mlock() or vault_module._libc is None:
+            pytest.skip("mlock not permitted")
+        test_file = temp_dir / "secrets.json"
+        test_file.write_bytes(b"secret" * 100)
+
+        assert mlock_file(test_file) is True
+        mm = vault_module._locked_mappings[str(test_file)][0]
+        assert mm[:] == b"secret" * 100
+        assert vault_module._locked_bytes >= len(mm)
+
+        secure_delete(test_file)
+        assert mm.closed
+        assert str(test_file) not in vault_module._locked_mappings
+
+    def test_mlock_file_locks_every_page(self, temp_dir):
+        """Test every page of a locked file is resident and locked, not only the return value."""
+        import ctypes
+
+        smaps = Path("/proc/self/smaps")
+        if not can_mlock() or vault_module._libc is None or not smaps.exists():
+            pytest.skip("mlock or /proc/self/smaps not available")
+        test_file = temp_dir / "secrets.json"
+        test_file.write_bytes(os.urandom(256 * 1024))
+
+        assert mlock_file(test_file) is True
+        try:
+            buf = vault_module._locked_mappings[str(test_file)][1]
+            start = f"{ctypes.addressof(buf):x}-"
+            del buf
+            lines = iter(smaps.read_text().splitlines())
+            next(line for line in lines if line.startswith(start))
+            locked = next(line for line in lines if line.startswith("Locked:"))
+            assert locked.split()[1] == "256"
+        finally:
+            secure_delete(test_file)
+
+    def test_mlock_file_respects_remaining_budget(self, temp_dir):
+        """Test a lock that would exceed the rlimit is refused before opening the file."""
+        if not can_mlock() or vault_module._libc is None:
+            pytest.skip("mlock not permitted")
+        test_file = temp_dir / "secrets.json"
+        test_file.write_bytes(b"secret")
+
+        with (
+            patch("nakimi.core.vault._locked_bytes", get_mlock_limit()),
+            patch("builtins.open") as mock_open_file,
+        ):
+            assert mlock_file(test_file) is False
+            mock_open_file.assert_not_called()
+
+    def test_mlock_range_falls_back_to_mlock(self):
+        """Test plain mlock is used when the kernel lacks mlock2."""
+        libc = Mock()
+        libc.mlock2.return_value = -1
+        libc.mlock.return_value = 0
+        with (
+            patch("nakimi.core.vault._libc", libc),
+            patch("ctypes.get_errno", return_value=errno.ENOSYS),
+        ):
+            assert vault_module._mlock_range(4096, 100) is True
+        libc.mlock2.assert_called_once_with(4096, 100, vault_module.MLOCK_ONFAULT)
+        libc.mlock.assert_called_once_with(4096, 100)
+
+    @staticmethod
+    def _load_vault_module(rlimit):
+        """Import a fresh copy of the vault module as if RLIMIT_MEMLOCK were rlimit."""
+        import importlib.util
+
+        name = "nakimi.core._vault_rlimit"
+        spec = importlib.util.spec_from_file_location(name, vault_module.__file__)
+        module = importlib.util.module_from_spec(spec)
+        with (
+            patch("resource.getrlimit", return_value=(rlimit, rlimit)),
+            patch("atexit.register"),
+        ):
+            spec.loader.exec_module(module)
+        return module
+
+    def test_unlimited_rlimit_enables_memory_protection(self, temp_dir):
+        """Test an unlimited RLIMIT_MEMLOCK (RLIM_INFINITY, -1) locks without a budget."""
+        import resource
+
+        module = self._load_vault_module(resource.RLIM_INFINITY)
+        assert module.can_mlock() is True
+        assert module._libc is not None
+        assert module._within_mlock_budget(1 << 40) is True
+
+        libc = Mock()
+        libc.mlockall.side_effect = [-1, 0]
+        module._libc = libc
+        with patch("ctypes.get_errno", return_value=errno.EINVAL):
+            assert module.Vault.enable_memory_protection() is True
+            assert module.Vault(vault_dir=temp_dir, lock_memory=True)
+
+        # Retried without ONFAULT, then not again once the process is locked
+        assert [c.args[0] for c in libc.mlockall.call_args_list] == [
+            module.MCL_CURRENT | module.MCL_FUTURE | module.MCL_ONFAULT,
+            module.MCL_CURRENT | module.MCL_FUTURE,
+        ]
+
+    def test_finite_rlimit_skips_mlockall(self):
+        """Test mlockall is not attempted under a finite RLIMIT_MEMLOCK, which is a budget."""
+        module = self._load_vault_module(64 * 1024)
+        assert module.can_mlock() is True
+        assert module._within_mlock_budget(64 * 1024) is True
+        assert module._within_mlock_budget(64 * 1024 + 1) is False
+
+        module._libc = Mock()
+        assert module.Vault.enable_memory_protection() is False
+        module._libc.mlockall.assert_not_called()
+
+    def test_zero_rlimit_disables_mlock(self):
+        """Test a zero RLIMIT_MEMLOCK leaves libc unloaded and every lock refused."""
+        module = self._load_vault_module(0)
+        assert module.can_mlock() is False
+        assert module._libc is None
+        assert module.Vault.enable_memory_protection() is False
+
+
+class TestGetSecureTempDir:
+    """Test get_secure_temp_dir function."""
+
+    def test_probe_runs_once(self):
+        """Test the platform and write probe is cached after the first call."""
+        get_secure_temp_dir.cache_clear()
+        first = get_secure_temp_dir()
+        with patch("platform.system") as mock_system:
+            assert get_secure_temp_dir() == first
+            mock_system.assert_not_called()
+
+
+class TestIsRamDisk:
+    """Test is_ram_disk function."""
+
+    MOUNTINFO = (
+        "22 1 253:0 / / rw,relatime shared:1 - ext4 /dev/vda rw\n"
+        "23 22 0:21 / /dev/shm rw,nosuid shared:2 - tmpfs tmpfs rw\n"
+        "24 22 0:22 / /mnt/ram\\040disk rw - ramfs none rw\n"
+        "25 22 253:1 / /dev/shm/disk rw - ext4 /dev/vdb rw\n"
+    )
+
+    def teardown_method(self):
+        vault_module._mount_table.cache_clear()
+
+    def test_classifies_from_mountinfo(self):
+        """Test the longest matching mount point decides, without running df."""
+        vault_module._mount_table.cache_clear()
+        with (
+            patch("builtins.open", mock_open(read_data=self.MOUNTINFO)),
+            patch("os.path.realpath", side_effect=lambda p: str(p)),
+            patch("subprocess.run") as mock_run,
+        ):
+            assert is_ram_disk("/dev/shm/nakimi-key.txt") is True
+            assert is_ram_disk("/mnt/ram disk/x") is True
+            assert is_ram_disk("/dev/shm/disk/x") is False
+            assert is_ram_disk("/dev/shmem/x") is False
+            assert is_ram_disk("/home/user/x") is False
+        mock_run.assert_not_called()
+
+
+class TestCreateMemfd:
+    """Test create_memfd function."""
+
+    def test_create_memfd(self):
+        """Test data is readable through the fd path until closed."""
+        fd = create_memfd(b"secret", "nakimi-test")
+        if fd is None:
+            pytest.skip("memfd_create not available")
+
+        path = Path(f"/proc/self/fd/{fd}")
+        try:
+            assert path.read_bytes() == b"secret"
+        finally:
+            os.close(fd)
+
+    def test_create_memfd_sealed(self):
+        """Test a sealed memfd stays readable but rejects writes."""
+        fd = create_memfd(b"secret", "nakimi-test", seal=True)
+        if fd is None or not hasattr(os, "memfd_create"):
+            pytest.skip("memfd_create not available")
+
+        try:
+            assert Path(f"/proc/self/fd/{fd}").read_bytes() == b"secret"
+            with pytest.raises(PermissionError):
+                os.pwrite(fd, b"x", 0)
+        finally:
+            os.close(fd)
+
+    def test_run_to_memory(self):
+        """Test a command's stdout is collected and its failures keep stderr."""
+        import sys
+
+        script = "; ".join(
+            [
+                "import sys",
+                "sys.stdout.write('secret')",
+                "sys.stderr.write('oops')",
+                "sys.exit(int(sys.argv[1]))",
+            ]
+        )
+        assert vault_module._run_to_memory([sys.executable, "-c", script, "0"]) == b"secret"
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            vault_module._run_to_memory([sys.executable, "-c", script, "1"])
+        assert exc_info.value.stderr == b"oops"
+
+    def test_run_to_memory_wipes_output_on_failure(self):
+        """Test partial output of a failed command is zeroed before the memfd is closed."""
+        import sys
+
+        if not hasattr(os, "memfd_create"):
+            pytest.skip("memfd_create not available")
+        memfds, contents = [], []
+        real_memfd_create, real_close = os.memfd_create, os.close
+
+        def memfd_create(*args):
+            memfds.append(real_memfd_create(*args))
+            return memfds[-1]
+
+        def close(fd):
+            if fd in memfds:
+                contents.append(os.pread(fd, 64, 0))
+            real_close(fd)
+
+        script = "import sys; sys.stdout.write('secret'); sys.exit(1)"
+        with (
+            patch("os.memfd_create", memfd_create),
+            patch("os.close", close),
+            pytest.raises(subprocess.CalledProcessError),
+        ):
+            vault_module._run_to_memory([sys.executable, "-c", script])
+        assert contents == [bytes(6)]
+
+    def test_create_memfd_tmpfile_fallback(self):
+        """Test an O_TMPFILE inode is used when memfd_create is unavailable."""
+        if not hasattr(os, "O_TMPFILE"):
+            pytest.skip("O_TMPFILE not available")
+
+        with patch("os.memfd_create", side_effect=OSError("unsupported")):
+            fd = create_memfd(b"secret", "nakimi-test")
+        if fd is None:
+            pytest.skip("O_TMPFILE not supported by the temp filesystem")
+
+        try:
+            assert Path(f"/proc/self/fd/{fd}").read_bytes() == b"secret"
+            assert os.fstat(fd).st_nlink == 0
+        finally:
+            os.close(fd)
+
+
+class TestWriteSecureTempFile:
+    """Test write_secure_temp_file function."""
+
+    def test_write_secure_temp_file(self):
+        """Test data lands in a private temp file."""
+        path = write_secure_temp_file(b"secret", prefix="nakimi-test-", suffix=".json")
+        try:
+            assert path.read_bytes() == b"secret"
+            assert path.name.startswith("nakimi-test-")
+            assert path.suffix == ".json"
+            assert path.stat().st_mode & 0o777 == 0o600
+        finally:
+            path.unlink()
+
 
 class TestSecureDelete:
     """Test secure_delete function."""
@@ -242,38 +972,60 @@ class TestSecureDelete:
         test_file = temp_dir / "nonexistent.txt"
         secure_delete(test_file)  # Should not raise
 
-    @patch("nakimi.core.vault.is_ram_disk")
+    @patch("nakimi.core.vault._is_rotational", return_value=True)
+    @patch("nakimi.core.vault.is_ram_disk", return_value=False)
     @patch("subprocess.run")
-    def test_secure_delete_with_shred(self, mock_run, mock_is_ram_disk, temp_dir):
-        """Test secure_delete using shred command."""
+    def test_secure_delete_overwrites_on_rotational(
+        self, mock_run, mock_is_ram_disk, mock_rotational, temp_dir
+    ):
+        """Test secure_delete overwrites in-process on a spinning disk."""
         test_file = temp_dir / "test.txt"
         test_file.write_text("test content")
 
-        # Mock as not RAM disk
-        mock_is_ram_disk.return_value = False
+        with patch("nakimi.core.vault._overwrite_file") as mock_overwrite:
+            secure_delete(test_file)
 
-        # Mock shred to succeed
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-
-        secure_delete(test_file)
-        mock_run.assert_called_once_with(["shred", "-u", str(test_file)], capture_output=True, check=True)
+        mock_overwrite.assert_called_once_with(test_file)
+        mock_run.assert_not_called()
+        assert not test_file.exists()
 
-    @patch("nakimi.core.vault.is_ram_disk")
-    @patch("subprocess.run", side_effect=FileNotFoundError())
-    def test_secure_delete_fallback(self, mock_run, mock_is_ram_disk, temp_dir):
-        """Test secure_delete falls back to unlink when shred not found."""
+    @patch("nakimi.core.vault._is_rotational", return_value=False)
+    @patch("nakimi.core.vault.is_ram_disk", return_value=False)
+    def test_secure_delete_skips_overwrite_on_ssd(
+        self,
+        mock_is_ram_disk,
+        mock_rotational,
+        temp_dir,
+    ):
+        """Test secure_delete only unlinks on non-rotational storage."""
         test_file = temp_dir / "test.txt"
         test_file.write_text("test content")
-        assert test_file.exists()
 
-        # Mock as not RAM disk
-        mock_is_ram_disk.return_value = False
+        with patch("nakimi.core.vault._overwrite_file") as mock_overwrite:
+            secure_delete(test_file)
 
-        secure_delete(test_file)
+        mock_overwrite.assert_not_called()
         assert not test_file.exists()
 
+    def test_is_rotational_cached_per_device(self, temp_dir):
+        """Test the sysfs lookup runs once per device."""
+        vault_module._device_is_rotational.cache_clear()
+        first = vault_module._is_rotational(temp_dir)
+        with patch("os.path.realpath") as mock_realpath:
+            assert vault_module._is_rotational(temp_dir) == first
+            mock_realpath.assert_not_called()
+
+    def test_overwrite_file(self, temp_dir):
+        """Test _overwrite_file replaces contents with same-length random data."""
+        test_file = temp_dir / "test.txt"
+        test_file.write_bytes(b"\x00" * 5000)
+
+        _overwrite_file(test_file, chunk_size=1024)
+
+        data = test_file.read_bytes()
+        assert len(data) == 5000
+        assert data != b"\x00" * 5000
+
     @patch("nakimi.core.vault.is_ram_disk")
     def test_secure_delete_on_ram_disk(self, mock_is_ram_disk, temp_dir):
         """Test secure_delete skips shred on RAM disk."""
@@ -4,6 +4,7 @@ Unit tests for yubikey.py
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from nakimi.core import yubikey as yubikey_module
 from nakimi.core.yubikey import YubiKeyManager, MockYubiKeyManager, YubiKeyError
 from nakimi.core.config import VaultConfig
 
@@ -19,6 +20,8 @@ class TestYubiKeyManager:
         os.environ["NAKIMI_YUBIKEY_SLOT"] = "9a"
         os.environ["NAKIMI_YUBIKEY_REQUIRE_TOUCH"] = "true"
         os.environ["NAKIMI_YUBIKEY_PIN_PROMPT"] = "true"
+        yubikey_module._ykman_installed = False
+        yubikey_module._age_plugin_installed = False
 
     def test_init_with_default_config(self):
         """Test YubiKeyManager initialization."""
@@ -47,6 +50,17 @@ class TestYubiKeyManager:
             # Should still be only one call due to caching
             assert mock_run.call_count == 1
 
+    def test_tool_probes_shared_across_managers(self):
+        """Test a successful tool probe is not repeated by other managers."""
+        config = VaultConfig()
+
+        with patch("subprocess.run") as mock_run:
+            assert YubiKeyManager(config)._check_ykman_installed() is True
+            assert YubiKeyManager(config)._check_ykman_installed() is True
+            assert YubiKeyManager(config)._check_age_plugin_installed() is True
+            assert YubiKeyManager(config)._check_age_plugin_installed() is True
+        assert mock_run.call_count == 2
+
     def test_check_ykman_installed_not_found(self):
         """Test ykman installed detection when not available."""
         config = VaultConfig()
@@ -64,46 +78,57 @@ class TestYubiKeyManager:
         config = VaultConfig()
         yk = YubiKeyManager(config)
 
-        # Mock ykman not installed
-        with patch.object(yk, "_check_ykman_installed", return_value=False):
+        # Mock neither ykman nor age-plugin-yubikey installed
+        with patch("subprocess.Popen", side_effect=FileNotFoundError()):
             result = yk._check_yubikey_present()
             assert result is False
             # Should cache the result
             assert yk._yubikey_present is False
+            assert yk._ykman_available is False
 
     def test_check_yubikey_present_with_ykman(self):
         """Test YubiKey presence detection when ykman is installed."""
         config = VaultConfig()
         yk = YubiKeyManager(config)
 
-        # Mock ykman installed and YubiKey present
-        with patch.object(yk, "_check_ykman_installed", return_value=True):
-            with patch("subprocess.run") as mock_run:
-                mock_result = Mock()
-                mock_result.returncode = 0
-                mock_result.stdout = "YubiKey 5 NFC [5.7.1]"
-                mock_run.return_value = mock_result
-
-                result = yk._check_yubikey_present()
-                assert result is True
-                mock_run.assert_called_once_with(
-                    ["ykman", "info"], capture_output=True, text=True, check=True
-                )
+        # Mock YubiKey present; the identity is fetched alongside
+        info = Mock(returncode=0)
+        info.communicate.return_value = ("YubiKey 5 NFC [5.7.1]", "")
+        identity = Mock(returncode=0)
+        identity.communicate.return_value = ("AGE-PLUGIN-YUBIKEY-1TEST\n", "")
+        with patch("subprocess.Popen", side_effect=[info, identity]) as mock_popen:
+            result = yk._check_yubikey_present()
+            assert result is True
+            assert yk._check_ykman_installed() is True
+            assert yk._get_yubikey_identity() == "AGE-PLUGIN-YUBIKEY-1TEST"
+            assert yk._check_age_plugin_installed() is True
+            assert [c.args[0] for c in mock_popen.call_args_list] == [
+                ["ykman", "info"],
+                ["age-plugin-yubikey", "--identity", "--slot", "9a"],
+            ]
+
+    def test_probe_reaps_first_process_when_second_spawn_fails(self):
+        """Test a half-started probe kills and waits for ykman before the error propagates."""
+        yk = YubiKeyManager(VaultConfig())
+
+        info = Mock()
+        with patch("subprocess.Popen", side_effect=[info, PermissionError()]):
+            with pytest.raises(PermissionError):
+                yk._check_yubikey_present()
+        info.kill.assert_called_once_with()
+        info.communicate.assert_called_once_with()
 
     def test_check_yubikey_present_error(self):
         """Test YubiKey presence detection when ykman command fails."""
-        import subprocess
-
         config = VaultConfig()
         yk = YubiKeyManager(config)
 
-        with patch.object(yk, "_check_ykman_installed", return_value=True):
-            with patch(
-                "subprocess.run",
-                side_effect=subprocess.CalledProcessError(1, "ykman info", stderr="No YubiKey"),
-            ):
-                result = yk._check_yubikey_present()
-                assert result is False
+        info = Mock(returncode=1)
+        info.communicate.return_value = ("", "No YubiKey")
+        with patch("subprocess.Popen", side_effect=[info, FileNotFoundError()]):
+            result = yk._check_yubikey_present()
+            assert result is False
+            assert yk._ykman_available is True
 
     def test_is_available_disabled_in_config(self):
         """Test is_available when YubiKey disabled in config."""
@@ -123,7 +148,7 @@ class TestYubiKeyManager:
         config._yubikey_enabled = True
         yk = YubiKeyManager(config)
 
-        with patch.object(yk, "_check_ykman_installed", return_value=False):
+        with patch("subprocess.Popen", side_effect=FileNotFoundError()):
             result = yk.is_available()
             assert result is False
 
@@ -138,6 +163,37 @@ class TestYubiKeyManager:
                 result = yk.is_available()
                 assert result is True
 
+    def test_status_bundle_single_ykman_call(self):
+        """Test status_bundle answers presence checks from one ykman info call."""
+        config = VaultConfig()
+        config._yubikey_enabled = True
+        yk = YubiKeyManager(config)
+
+        info = Mock(returncode=0, stdout="YubiKey 5 NFC [5.7.1]")
+        slot = Mock(returncode=0, stdout="Algorithm: ECCP256\nSubject DN: CN=nakimi\n")
+        with patch("subprocess.run", side_effect=[info, slot]) as mock_run:
+            with patch("shutil.which", return_value=None):
+                status = yk.status_bundle()
+
+        assert status["ykman_installed"] is True
+        assert status["yubikey_present"] is True
+        assert status["age_plugin_installed"] is False
+        assert status["slot_info"] == {"Algorithm": "ECCP256", "Subject DN": "CN=nakimi"}
+        assert mock_run.call_args_list[0].args[0] == ["ykman", "info"]
+        assert mock_run.call_count == 2
+
+    def test_status_bundle_no_ykman(self):
+        """Test status_bundle when ykman is not installed."""
+        yk = YubiKeyManager(VaultConfig())
+
+        with patch("subprocess.run", side_effect=FileNotFoundError()) as mock_run:
+            status = yk.status_bundle()
+
+        assert status["ykman_installed"] is False
+        assert status["yubikey_present"] is False
+        assert status["slot_info"] is None
+        mock_run.assert_called_once()
+
     def test_encrypt_age_key(self):
         """Test encrypt_age_key with mocked age-plugin-yubikey."""
         config = VaultConfig()
@@ -163,6 +219,25 @@ class TestYubiKeyManager:
                             check=True,
                         )
 
+    def test_recipient_cached_until_encryption_fails(self):
+        """Test the slot recipient is looked up once and refetched after a failed encrypt."""
+        import subprocess
+
+        yk = YubiKeyManager(VaultConfig())
+        listing = Mock(stdout="# comment\nage1yubikey1testrecipient\n")
+        encrypted = Mock(stdout=b"ENCRYPTED_DATA")
+        failure = subprocess.CalledProcessError(1, "age", stderr=b"plugin error")
+
+        with patch.object(yk, "_check_age_plugin_installed", return_value=True):
+            responses = [listing, encrypted, encrypted, failure]
+            with patch("subprocess.run", side_effect=responses) as mock_run:
+                yk.encrypt_age_key("AGE-SECRET-KEY-1A")
+                yk.encrypt_age_key("AGE-SECRET-KEY-1B")
+                with pytest.raises(YubiKeyError, match="plugin error"):
+                    yk.encrypt_age_key("AGE-SECRET-KEY-1C")
+        assert mock_run.call_count == 4
+        assert yk._recipient is None
+
     def test_decrypt_age_key(self):
         """Test decrypt_age_key with mocked age-plugin-yubikey."""
         config = VaultConfig()